@@ -0,0 +1,161 @@
+"""Async implementations of the hot BlogViewSet read actions.
+
+They return the same payloads as their sync counterparts but run on the
+event loop under ASGI, using Django's async ORM and cache APIs instead of
+being pushed through a thread-pool adapter.
+"""
+import math
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import exceptions
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from blogging_project.dbrouters import reads_from_replica
+from user_auth.authentication import CachedJWTAuthentication
+from .models import Blog
+from .serializers import BlogSerializer, BlogDetailSerializer, CommentSerializer, aload_likes
+from .views import BlogPagination, CommentPagination, COMMENTS_ON_DETAIL_BLOG
+from . import cache, events, likes
+from .viewcounts import view_counter
+
+
+def _page_size(request, pagination):
+    try:
+        size = int(request.GET[pagination.page_size_query_param])
+    except (KeyError, ValueError):
+        return pagination.page_size
+    return min(size, pagination.max_page_size) if size > 0 else pagination.page_size
+
+
+async def paginate(request, queryset, pagination_class, serializer_class, load_context=None):
+    """Page-number pagination with the same response shape as PageNumberPagination.
+
+    ``load_context`` is awaited with the page's objects for the serializer context.
+    """
+    pagination = pagination_class()
+    page_size = _page_size(request, pagination)
+    try:
+        page_number = int(request.GET.get(pagination.page_query_param, 1))
+    except ValueError:
+        page_number = 0
+    count = await queryset.acount()
+    num_pages = max(1, math.ceil(count / page_size))
+    if not 1 <= page_number <= num_pages:
+        return None
+    offset = (page_number - 1) * page_size
+    page = [obj async for obj in queryset[offset:offset + page_size]]
+
+    url = request.build_absolute_uri()
+    next_url = replace_query_param(url, pagination.page_query_param, page_number + 1) if page_number < num_pages else None
+    if page_number == 1:
+        previous_url = None
+    elif page_number == 2:
+        previous_url = remove_query_param(url, pagination.page_query_param)
+    else:
+        previous_url = replace_query_param(url, pagination.page_query_param, page_number - 1)
+    return {
+        'count': count,
+        'next': next_url,
+        'previous': previous_url,
+        'results': serializer_class(page, many=True, context=await load_context(page) if load_context else {}).data,
+    }
+
+
+async def _viewer(request):
+    """The user of the request's bearer token, for ``liked_by_me``; None without a valid one."""
+    try:
+        result = await CachedJWTAuthentication().aauthenticate(request)
+    except exceptions.AuthenticationFailed:
+        return None
+    return result and result[0]
+
+
+def _invalid_page():
+    return JsonResponse({"detail": "Invalid page."}, status=404)
+
+
+@reads_from_replica
+async def list_blogs(request):
+    cache_key = await cache.alist_cache_key(request)
+    payload = await cache.aget_list_payload(cache_key)
+    if payload is not None:
+        if isinstance(payload, dict):
+            await likes.amark_liked(payload['results'], await _viewer(request))
+        return JsonResponse(payload, safe=False)
+    queryset = Blog.objects.filter(is_visible=True).order_by('-created_at', '-id')
+    if not await queryset.aexists():
+        return JsonResponse([], safe=False)
+    payload = await paginate(request, queryset, BlogPagination, BlogSerializer, aload_likes)
+    if payload is None:
+        return _invalid_page()
+    await cache.aset_list_payload(cache_key, payload)
+    await likes.amark_liked(payload['results'], await _viewer(request))
+    return JsonResponse(payload)
+
+
+@reads_from_replica
+async def get_blog_by_id(request, pk):
+    payload = await cache.aget_blog_payload(pk, 'by_id')
+    if payload is None:
+        blog = await Blog.objects.filter(pk=pk, is_visible=True).afirst()
+        if blog is None:
+            return JsonResponse(None, status=404, safe=False)
+        payload = BlogSerializer(blog, context=await aload_likes([blog])).data
+        await cache.aset_blog_payload(pk, 'by_id', payload)
+    await likes.amark_liked([payload], await _viewer(request), [pk])
+    view_counter.record(pk)
+    return JsonResponse(payload)
+
+
+@reads_from_replica
+async def details(request, pk):
+    payload = await cache.aget_blog_payload(pk, 'details')
+    if payload is None:
+        blog = await Blog.objects.filter(pk=pk, is_visible=True).afirst()
+        if blog is None:
+            return JsonResponse(None, status=404, safe=False)
+        comments = blog.comments.filter(is_visible=True).order_by('-created_at', '-id')[:COMMENTS_ON_DETAIL_BLOG]
+        latest_comments = [comment async for comment in comments]
+        context = dict(await aload_likes([blog]), latest_comments=latest_comments)
+        payload = BlogDetailSerializer(blog, context=context).data
+        await cache.aset_blog_payload(pk, 'details', payload)
+    await likes.amark_liked([payload], await _viewer(request), [pk])
+    view_counter.record(pk)
+    return JsonResponse(payload)
+
+
+@reads_from_replica
+async def list_comments(request, pk):
+    blog = await Blog.objects.filter(pk=pk).afirst()
+    if blog is None:
+        return JsonResponse({"detail": "No Blog matches the given query."}, status=404)
+    if not blog.is_visible:
+        return JsonResponse([], safe=False)
+    queryset = blog.comments.filter(is_visible=True).order_by('-created_at', '-id')
+    if not await queryset.aexists():
+        return JsonResponse([], safe=False)
+    payload = await paginate(request, queryset, CommentPagination, CommentSerializer)
+    if payload is None:
+        return _invalid_page()
+    return JsonResponse(payload)
+
+
+@reads_from_replica
+async def blog_events(request, pk):
+    """Server-Sent Events of new comments, edits and likes on blog ``pk``, see ``blog.events``."""
+    if not await Blog.objects.filter(pk=pk, is_visible=True).aexists():
+        return JsonResponse({"detail": "No Blog matches the given query."}, status=404)
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID') or request.GET['last_event_id'])
+    except (KeyError, ValueError):
+        last_event_id = None
+    try:
+        subscription = events.hub.subscribe(pk, last_event_id)
+    except events.HubFull:
+        response = JsonResponse({"detail": "Too many event streams, retry later."}, status=503)
+        response['Retry-After'] = str(settings.SSE_HEARTBEAT)
+        return response
+    response = StreamingHttpResponse(events.stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
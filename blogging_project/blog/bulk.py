@@ -0,0 +1,106 @@
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Blog, Like, Comment
+from .counters import refresh_counters
+from .serializers import BulkCommentItemSerializer, CommentSerializer
+from . import cache, events, threads, trending
+
+BLOG_NOT_FOUND = "Blog not found"
+PARENT_NOT_FOUND = 'Invalid pk "{}" - object does not exist.'
+PARENT_ELSEWHERE = "The parent comment belongs to another blog."
+
+# Like likes.like and likes.unlike, these return the blogs whose like actually changed.
+_INSERT = """INSERT INTO {like} (user_id, blog_id, created_by_id, created_at, updated_at)
+    SELECT %s, id, %s, %s, %s FROM {blog} WHERE id IN ({ids}) AND is_visible
+    ON CONFLICT (user_id, blog_id) DO NOTHING
+    RETURNING blog_id"""
+_DELETE = "DELETE FROM {like} WHERE user_id = %s AND blog_id IN ({ids}) RETURNING blog_id"
+
+
+def _changed(sql, params, blog_ids):
+    query = sql.format(like=Like._meta.db_table, blog=Blog._meta.db_table, ids=', '.join(['%s'] * len(blog_ids)))
+    with connection.cursor() as cursor:
+        cursor.execute(query, [*params, *blog_ids])
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _visible_blog_ids(blog_ids):
+    return set(Blog.objects.filter(pk__in=set(blog_ids), is_visible=True).values_list('id', flat=True))
+
+
+def _refresh_blogs(blog_ids):
+    # Bulk writes bypass the per-row signal receivers, so counters and scores are recomputed set-wise.
+    refresh_counters(Blog.objects.filter(pk__in=blog_ids))
+    trending.rebuild(blog_ids)
+
+
+def _id_results(blog_ids, visible, done):
+    return [{"blog": pk, "status": done} if pk in visible else {"blog": pk, "error": BLOG_NOT_FOUND} for pk in blog_ids]
+
+
+def bulk_like(user, blog_ids):
+    visible = _visible_blog_ids(blog_ids)
+    if visible:
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        with transaction.atomic():
+            for blog_id in _changed(_INSERT, [user.pk, user.created_by_id, now, now], visible):
+                events.publish_on_commit(blog_id, 'like', {'user': user.pk})
+            _refresh_blogs(visible)
+        cache.invalidate_blogs(visible)
+    return _id_results(blog_ids, visible, "liked")
+
+
+def bulk_unlike(user, blog_ids):
+    visible = _visible_blog_ids(blog_ids)
+    if visible:
+        with transaction.atomic():
+            for blog_id in _changed(_DELETE, [user.pk], visible):
+                events.publish_on_commit(blog_id, 'unlike', {'user': user.pk})
+            _refresh_blogs(visible)
+        cache.invalidate_blogs(visible)
+    return _id_results(blog_ids, visible, "unliked")
+
+
+def bulk_comment(user, items, context):
+    results = [None] * len(items)
+    pending = []
+    for index, item in enumerate(items):
+        serializer = BulkCommentItemSerializer(data=item, context=context)
+        blog_id = item.get('blog') if isinstance(item, dict) else None
+        if not isinstance(blog_id, int) or isinstance(blog_id, bool):
+            results[index] = {"index": index, "errors": {"blog": ["A valid blog id is required."]}}
+        elif not serializer.is_valid():
+            results[index] = {"index": index, "errors": serializer.errors}
+        else:
+            pending.append((index, blog_id, serializer.validated_data))
+
+    visible = _visible_blog_ids(blog_id for _, blog_id, _ in pending)
+    parent_ids = {data['parent'] for _, blog_id, data in pending if blog_id in visible and data.get('parent') is not None}
+    parents = Comment.objects.only('blog_id', 'path').in_bulk(parent_ids) if parent_ids else {}
+    comments = []
+    for index, blog_id, data in pending:
+        parent_id = data.pop('parent', None)
+        parent = parents.get(parent_id)
+        if blog_id not in visible:
+            results[index] = {"index": index, "errors": {"blog": [BLOG_NOT_FOUND]}}
+        elif parent_id is not None and parent is None:
+            results[index] = {"index": index, "errors": {"parent": [PARENT_NOT_FOUND.format(parent_id)]}}
+        elif parent is not None and parent.blog_id != blog_id:
+            results[index] = {"index": index, "errors": {"parent": [PARENT_ELSEWHERE]}}
+        else:
+            comment = Comment(user=user, blog_id=blog_id, created_by_id=user.created_by_id, **data)
+            comment.parent = parent
+            comments.append((index, comment))
+
+    if comments:
+        blog_ids = {comment.blog_id for _, comment in comments}
+        with transaction.atomic():
+            Comment.objects.bulk_create([comment for _, comment in comments])
+            threads.assign_paths([comment for _, comment in comments])
+            _refresh_blogs(blog_ids)
+            for index, comment in comments:
+                data = CommentSerializer(comment, context=context).data
+                events.publish_on_commit(comment.blog_id, 'comment', data)
+                results[index] = {"index": index, "comment": data}
+        cache.invalidate_blogs(blog_ids)
+    return results
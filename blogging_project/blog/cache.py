@@ -0,0 +1,253 @@
+import hashlib
+import threading
+from functools import partial
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+LIST_GENERATION_KEY = 'blog:list:generation'
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def _cache():
+    return caches[settings.BLOG_CACHE_ALIAS]
+
+
+def _blog_key(pk):
+    try:
+        return f'blog:{int(pk)}'
+    except (TypeError, ValueError):
+        return None
+
+
+def _record(kind, outcome):
+    with _stats_lock:
+        counters = _stats.setdefault(kind, {'hits': 0, 'misses': 0, 'sets': 0, 'invalidations': 0})
+        counters[outcome] += 1
+
+
+def stats():
+    """Hit/miss counters of this worker process, per payload kind."""
+    with _stats_lock:
+        result = {kind: dict(counters) for kind, counters in _stats.items()}
+    for counters in result.values():
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_ratio'] = round(counters['hits'] / lookups, 4) if lookups else None
+    return result
+
+
+def get_blog_payload(pk, kind):
+    key = _blog_key(pk)
+    if key is None:
+        return None
+    payload = (_cache().get(key) or {}).get(kind)
+    _record(kind, 'misses' if payload is None else 'hits')
+    return payload
+
+
+async def aget_blog_payload(pk, kind):
+    key = _blog_key(pk)
+    if key is None:
+        return None
+    payload = (await _cache().aget(key) or {}).get(kind)
+    _record(kind, 'misses' if payload is None else 'hits')
+    return payload
+
+
+def set_blog_payload(pk, kind, payload):
+    key = _blog_key(pk)
+    if key is None:
+        return
+    cache = _cache()
+    entry = cache.get(key) or {}
+    entry[kind] = payload
+    cache.set(key, entry, settings.BLOG_CACHE_TIMEOUT)
+    _record(kind, 'sets')
+
+
+async def aset_blog_payload(pk, kind, payload):
+    key = _blog_key(pk)
+    if key is None:
+        return
+    cache = _cache()
+    entry = await cache.aget(key) or {}
+    entry[kind] = payload
+    await cache.aset(key, entry, settings.BLOG_CACHE_TIMEOUT)
+    _record(kind, 'sets')
+
+
+def get_blog_payloads(pks, kind):
+    """``{pk: payload}`` for the blogs in ``pks`` whose ``kind`` payload is cached, in one cache round trip."""
+    keys = {key: pk for key, pk in ((_blog_key(pk), pk) for pk in pks) if key}
+    entries = _cache().get_many(list(keys))
+    payloads = {keys[key]: entry[kind] for key, entry in entries.items() if kind in entry}
+    for pk in keys.values():
+        _record(kind, 'hits' if pk in payloads else 'misses')
+    return payloads
+
+
+def set_blog_payloads(payloads, kind):
+    keys = {_blog_key(pk): payload for pk, payload in payloads.items()}
+    keys.pop(None, None)
+    cache = _cache()
+    entries = cache.get_many(list(keys))
+    for key, payload in keys.items():
+        entries.setdefault(key, {})[kind] = payload
+        _record(kind, 'sets')
+    cache.set_many(entries, settings.BLOG_CACHE_TIMEOUT)
+
+
+def list_generation():
+    cache = _cache()
+    generation = cache.get(LIST_GENERATION_KEY)
+    if generation is None:
+        cache.add(LIST_GENERATION_KEY, 1, None)
+        generation = cache.get(LIST_GENERATION_KEY, 1)
+    return generation
+
+
+async def alist_generation():
+    cache = _cache()
+    generation = await cache.aget(LIST_GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(LIST_GENERATION_KEY, 1, None)
+        generation = await cache.aget(LIST_GENERATION_KEY, 1)
+    return generation
+
+
+def bump_list_generation():
+    cache = _cache()
+    try:
+        cache.incr(LIST_GENERATION_KEY)
+    except ValueError:
+        cache.add(LIST_GENERATION_KEY, 1, None)
+    _record('list', 'invalidations')
+
+
+def _is_cached_page(params):
+    page = params.get('page', '1')
+    return 'cursor' not in params and page.isdigit() and int(page) <= settings.BLOG_CACHE_LIST_PAGES
+
+
+def _list_key(request, generation):
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'blog:list:{generation}:{url}'
+
+
+def list_cache_key(request):
+    """Key for a cacheable list page, or None when the page is not cached.
+
+    The list generation is read once here, so a payload computed before an
+    invalidation can never be stored under the newer generation.
+    """
+    if not _is_cached_page(request.GET):
+        return None
+    return _list_key(request, list_generation())
+
+
+async def alist_cache_key(request):
+    if not _is_cached_page(request.GET):
+        return None
+    return _list_key(request, await alist_generation())
+
+
+def _author_generation_key(author_id):
+    return f'blog:author:{int(author_id)}:generation'
+
+
+def author_page_key(request, author_id):
+    """Key for the first page of an author's blogs, or None for any other page.
+
+    Versioned by a per-author generation, so writes by other authors leave
+    it alone.
+    """
+    params = request.GET
+    if 'cursor' in params or params.get('page', '1') != '1':
+        return None
+    cache = _cache()
+    generation_key = _author_generation_key(author_id)
+    generation = cache.get(generation_key)
+    if generation is None:
+        cache.add(generation_key, 1, None)
+        generation = cache.get(generation_key, 1)
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'blog:author:{int(author_id)}:{generation}:{url}'
+
+
+def invalidate_author(author_id):
+    cache = _cache()
+    try:
+        cache.incr(_author_generation_key(author_id))
+    except ValueError:
+        cache.add(_author_generation_key(author_id), 1, None)
+    _record('author', 'invalidations')
+
+
+def get_author_page(key):
+    if key is None:
+        return None
+    page = _cache().get(key)
+    _record('author', 'misses' if page is None else 'hits')
+    return page
+
+
+def set_author_page(key, page):
+    if key is None:
+        return
+    _cache().set(key, page, settings.BLOG_CACHE_TIMEOUT)
+    _record('author', 'sets')
+
+
+def get_list_payload(key):
+    if key is None:
+        return None
+    payload = _cache().get(key)
+    _record('list', 'misses' if payload is None else 'hits')
+    return payload
+
+
+async def aget_list_payload(key):
+    if key is None:
+        return None
+    payload = await _cache().aget(key)
+    _record('list', 'misses' if payload is None else 'hits')
+    return payload
+
+
+def set_list_payload(key, payload):
+    if key is None:
+        return
+    _cache().set(key, payload, settings.BLOG_CACHE_TIMEOUT)
+    _record('list', 'sets')
+
+
+async def aset_list_payload(key, payload):
+    if key is None:
+        return
+    await _cache().aset(key, payload, settings.BLOG_CACHE_TIMEOUT)
+    _record('list', 'sets')
+
+
+def invalidate_blogs(pks):
+    keys = [key for key in map(_blog_key, pks) if key]
+    if keys:
+        _cache().delete_many(keys)
+        _record('blog', 'invalidations')
+    bump_list_generation()
+
+
+def invalidate_blog(pk):
+    invalidate_blogs([pk])
+
+
+def after_write(invalidate, *args):
+    """Run ``invalidate(*args)`` now and, inside a transaction, again once it commits.
+
+    A read that runs before the commit, e.g. on the replica, can cache the
+    old state again; the second run drops that payload.
+    """
+    invalidate(*args)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(invalidate, *args))
@@ -0,0 +1,20 @@
+"""System checks for what the blog app needs from the database."""
+import sqlite3
+from django.conf import settings
+from django.core import checks
+
+# likes and bulk write with INSERT/DELETE ... RETURNING, which Django itself does not need.
+SQLITE_MIN_VERSION = (3, 35)
+
+
+@checks.register()
+def check_sqlite_version(app_configs, **kwargs):
+    uses_sqlite = any(database['ENGINE'] == 'django.db.backends.sqlite3' for database in settings.DATABASES.values())
+    if not uses_sqlite or sqlite3.sqlite_version_info >= SQLITE_MIN_VERSION:
+        return []
+    return [checks.Error(
+        f"SQLite {sqlite3.sqlite_version} is too old, likes and bulk actions need SQLite "
+        f"{'.'.join(map(str, SQLITE_MIN_VERSION))} or newer for RETURNING.",
+        hint="Upgrade the SQLite library that Python's sqlite3 module is linked against.",
+        id='blog.E001',
+    )]
@@ -0,0 +1,55 @@
+"""ETag / Last-Modified validators for blog reads, computed without serializing the body."""
+import hashlib
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from .models import Blog
+from . import cache
+
+
+def blog_validators(request, pk, weak=False):
+    """Return ``(etag, last_modified)`` for the representation of blog ``pk`` at this URL.
+
+    The version is built from the blog row alone: ``updated_at`` for edits,
+    ``last_activity_at`` and the counters for likes and comments. It is
+    cached next to the blog's payloads and dropped with them. The viewer is
+    part of the ETag as well, for its ``liked_by_me``. Returns None when the
+    blog is missing or hidden, leaving the 404 to the view.
+    """
+    version = cache.get_blog_payload(pk, 'validators')
+    if version is None:
+        row = Blog.objects.filter(pk=pk, is_visible=True).values_list(
+            'updated_at', 'last_activity_at', 'likes_count', 'comments_count'
+        ).first()
+        if row is None:
+            return None
+        updated_at, last_activity_at, likes_count, comments_count = row
+        version = {
+            'tag': f'{pk}|{updated_at.isoformat()}|{last_activity_at and last_activity_at.isoformat()}|{likes_count}|{comments_count}',
+            'last_modified': int(max(updated_at, last_activity_at or updated_at).timestamp()),
+        }
+        cache.set_blog_payload(pk, 'validators', version)
+    viewer = request.user.pk if request.user.is_authenticated else ''
+    digest = hashlib.md5(f"{version['tag']}|{viewer}|{request.get_full_path()}".encode()).hexdigest()
+    etag = f'W/"{digest}"' if weak else f'"{digest}"'
+    return etag, version['last_modified']
+
+
+def not_modified(request, validators):
+    """A 304 response when the client's If-None-Match/If-Modified-Since still match, else None."""
+    if validators is None:
+        return None
+    etag, last_modified = validators
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, validators)
+    return response
+
+
+def set_validators(response, validators):
+    if validators is not None and response.status_code == 200:
+        etag, last_modified = validators
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'no-cache'
+        patch_vary_headers(response, ['Authorization'])
+    return response
@@ -0,0 +1,36 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import Blog, Like, Comment
+
+
+def _count_subquery(model):
+    counts = model.objects.filter(blog=OuterRef('pk')).order_by().values('blog').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def adjust_counters(blog_id, likes=0, comments=0):
+    """Apply counter deltas and stamp ``last_activity_at``, even when both deltas are zero."""
+    changes = {'last_activity_at': timezone.now()}
+    if likes:
+        changes['likes_count'] = F('likes_count') + likes
+    if comments:
+        changes['comments_count'] = F('comments_count') + comments
+    Blog.objects.filter(pk=blog_id).update(**changes)
+
+
+def refresh_counters(queryset):
+    """Recompute likes_count/comments_count for every blog in ``queryset`` in one UPDATE."""
+    return queryset.update(
+        likes_count=_count_subquery(Like),
+        comments_count=_count_subquery(Comment),
+        last_activity_at=timezone.now(),
+    )
+
+
+def drifted_blogs(queryset=None):
+    queryset = Blog.objects.all() if queryset is None else queryset
+    return queryset.annotate(
+        actual_likes=_count_subquery(Like),
+        actual_comments=_count_subquery(Comment),
+    ).filter(~Q(likes_count=F('actual_likes')) | ~Q(comments_count=F('actual_comments')))
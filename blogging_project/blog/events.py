@@ -0,0 +1,176 @@
+"""In-process pub/sub of blog activity, streamed to clients as Server-Sent Events.
+
+Write actions publish once their transaction has committed and every SSE
+connection of the same worker process watching that blog receives the
+event. A connection is one coroutine waiting on its queue, so idle ones
+cost next to nothing. Each blog keeps its last SSE_HISTORY events, which
+lets a reconnecting client resume from its ``Last-Event-ID``. A reader that
+falls SSE_QUEUE_SIZE events behind is disconnected rather than buffered
+without bound; it resumes from the history like any other reconnect.
+
+Event ids are only meaningful within one process, and writes handled by
+another process are not seen. A client that cannot resume gets a
+``reset`` event and should reload the blog.
+"""
+import asyncio
+import itertools
+import json
+import threading
+from collections import OrderedDict, deque
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+
+class HubFull(Exception):
+    pass
+
+
+class Subscription:
+    __slots__ = ('blog_id', 'loop', 'queue', 'backlog', 'reset', 'closed')
+
+    def __init__(self, blog_id, loop):
+        self.blog_id = blog_id
+        self.loop = loop
+        self.queue = asyncio.Queue()
+        self.backlog = []
+        self.reset = False
+        self.closed = False
+
+    def deliver(self, event):
+        # Runs on the subscriber's event loop.
+        if self.closed:
+            return
+        if self.queue.qsize() >= settings.SSE_QUEUE_SIZE:
+            self.closed = True
+            hub.count('dropped')
+            event = None
+        self.queue.put_nowait(event)
+
+
+class History:
+    """The latest events of one blog, and the id of the newest event that no longer fits."""
+    __slots__ = ('events', 'dropped')
+
+    def __init__(self, dropped=0):
+        self.events = deque(maxlen=settings.SSE_HISTORY)
+        self.dropped = dropped
+
+    def append(self, event):
+        if len(self.events) == self.events.maxlen:
+            self.dropped = self.events[0][0]
+        self.events.append(event)
+
+
+class EventHub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._history = OrderedDict()
+        # Newest event id of any blog whose history was evicted.
+        self._evicted = 0
+        self._subscribers = {}
+        self._total = 0
+        self._stats = {'published': 0, 'delivered': 0, 'dropped': 0}
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def publish(self, blog_id, name, data):
+        """Send event ``name`` with JSON ``data`` to the subscribers of ``blog_id``; thread-safe."""
+        with self._lock:
+            self._last_id = next(self._ids)
+            event = (self._last_id, name, json.dumps(data, cls=DjangoJSONEncoder))
+            history = self._history.get(blog_id)
+            if history is None:
+                # Its earlier events may have been evicted with its history.
+                history = self._history[blog_id] = History(self._evicted)
+                while len(self._history) > settings.SSE_HISTORY_BLOGS:
+                    _, evicted = self._history.popitem(last=False)
+                    self._evicted = max(self._evicted, evicted.events[-1][0])
+            else:
+                self._history.move_to_end(blog_id)
+            history.append(event)
+            subscribers = list(self._subscribers.get(blog_id, ()))
+            self._stats['published'] += 1
+            self._stats['delivered'] += len(subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down, its stream is gone too.
+                pass
+
+    def subscribe(self, blog_id, last_event_id=None):
+        """Register a subscriber on the running event loop, with the events it missed since ``last_event_id``."""
+        subscription = Subscription(blog_id, asyncio.get_running_loop())
+        with self._lock:
+            if self._total >= settings.SSE_MAX_SUBSCRIBERS:
+                raise HubFull
+            self._subscribers.setdefault(blog_id, set()).add(subscription)
+            self._total += 1
+            if last_event_id is not None:
+                history = self._history.get(blog_id)
+                if history is None:
+                    # No events since this process started, unless its history was evicted.
+                    subscription.reset = last_event_id > self._last_id or last_event_id < self._evicted
+                else:
+                    subscription.backlog = [event for event in history.events if event[0] > last_event_id]
+                    # Ids from another process or lifetime, or events that fell out of the history.
+                    subscription.reset = last_event_id > self._last_id or last_event_id < history.dropped
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.blog_id)
+            if subscribers and subscription in subscribers:
+                subscribers.discard(subscription)
+                self._total -= 1
+                if not subscribers:
+                    del self._subscribers[subscription.blog_id]
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, subscribers=self._total, last_event_id=self._last_id)
+
+
+hub = EventHub()
+
+
+def publish_on_commit(blog_id, name, data):
+    transaction.on_commit(lambda: hub.publish(blog_id, name, data))
+
+
+def _format(event):
+    event_id, name, data = event
+    return f'id: {event_id}\nevent: {name}\ndata: {data}\n\n'
+
+
+async def stream(subscription):
+    """The SSE body of ``subscription``: backlog first, then live events and heartbeats until it is dropped."""
+    try:
+        yield f'retry: {settings.SSE_RETRY_MS}\n\n'
+        if subscription.reset:
+            yield _format((hub.stats()['last_event_id'], 'reset', '{}'))
+        elif subscription.backlog:
+            yield ''.join(map(_format, subscription.backlog))
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), settings.SSE_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ': heartbeat\n\n'
+                continue
+            events = [event]
+            # Send whatever else is already queued in the same write.
+            while not subscription.queue.empty() and events[-1] is not None:
+                events.append(subscription.queue.get_nowait())
+            if events[-1] is None:
+                if len(events) > 1:
+                    yield ''.join(map(_format, events[:-1]))
+                return
+            yield ''.join(map(_format, events))
+    finally:
+        subscription.closed = True
+        hub.unsubscribe(subscription)
@@ -0,0 +1,60 @@
+"""NDJSON export of every blog with its comments, streamed in constant memory."""
+import itertools
+import json
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from .models import Blog, Comment
+
+CHUNK_SIZE = 500
+
+# Output key -> model attribute, matching the names used by the API serializers.
+BLOG_FIELDS = {
+    'id': 'id', 'author': 'author_id', 'title': 'title', 'content': 'content', 'created_at': 'created_at',
+    'updated_at': 'updated_at', 'likes_count': 'likes_count', 'comments_count': 'comments_count',
+    'views_count': 'views_count', 'created_by': 'created_by_id',
+}
+COMMENT_FIELDS = {'id': 'id', 'user': 'user_id', 'parent': 'parent_id', 'content': 'content', 'created_at': 'created_at', 'created_by': 'created_by_id'}
+
+
+def _record(blog):
+    record = {key: getattr(blog, attname) for key, attname in BLOG_FIELDS.items()}
+    record['comments'] = [
+        {key: getattr(comment, attname) for key, attname in COMMENT_FIELDS.items()}
+        for comment in blog.comments.all()
+    ]
+    return record
+
+
+def iter_records(chunk_size=CHUNK_SIZE):
+    """Yield one dict per blog, oldest first, with its comments.
+
+    Blogs are read ``chunk_size`` rows at a time and the comments of each
+    chunk with a single prefetch query, so memory is bounded by the chunk,
+    not by the corpus. Like counts come from the denormalized counter.
+    """
+    comments = Comment.objects.only(*COMMENT_FIELDS.values(), 'blog_id').order_by('created_at', 'id')
+    blogs = Blog.objects.only(*BLOG_FIELDS.values()).order_by('id').prefetch_related(Prefetch('comments', queryset=comments))
+    for blog in blogs.iterator(chunk_size=chunk_size):
+        yield _record(blog)
+
+
+def iter_ndjson(chunk_size=CHUNK_SIZE):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for record in iter_records(chunk_size):
+        yield encoder.encode(record) + '\n'
+
+
+async def aiter_ndjson(chunk_size=CHUNK_SIZE):
+    """``iter_ndjson`` for ASGI, which would otherwise read a sync iterator to the end before sending anything.
+
+    Lines are taken ``chunk_size`` at a time on the request's sync thread,
+    where the blog cursor lives, and sent as one chunk each.
+    """
+    lines = iter_ndjson(chunk_size)
+    take = sync_to_async(lambda: ''.join(itertools.islice(lines, chunk_size)))
+    try:
+        while chunk := await take():
+            yield chunk
+    finally:
+        await sync_to_async(lines.close)()
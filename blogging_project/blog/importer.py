@@ -0,0 +1,244 @@
+"""Bulk loading of users, blogs, likes and comments from NDJSON or CSV files.
+
+Rows are inserted with bulk_create, one transaction per batch, and never go
+through model signals. Denormalized counters, trending scores and the search
+index are rebuilt once at the end instead of row by row. Foreign keys hold
+the ``id`` values of the source files and are resolved through in-memory
+maps of source id to primary key.
+"""
+import csv
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from user_auth.hashing import make_passwords
+from user_auth.models import User
+from .counters import refresh_counters
+from .models import Blog, Like, Comment
+from . import cache, search, threads, trending, visibility
+
+MAX_ERRORS = 20
+
+
+@dataclass
+class ImportReport:
+    kind: str
+    loaded: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rate(self):
+        return self.loaded / self.seconds if self.seconds else 0.0
+
+    def skip(self, kind, row, reason):
+        self.skipped += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{kind} {row.get('id', '?')}: {reason}")
+
+
+def read_rows(path):
+    """Yield dicts from a ``.csv`` file (with a header row) or an NDJSON file."""
+    with open(path, newline='', encoding='utf-8') as source:
+        if str(path).endswith('.csv'):
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _timestamp(value, default):
+    if not value:
+        return default
+    parsed = parse_datetime(value) if isinstance(value, str) else value
+    if parsed is None:
+        raise ValueError(f"invalid datetime {value!r}")
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def _flag(value, default):
+    if value in (None, ''):
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+@contextmanager
+def keep_timestamps(*models):
+    """Store the given created_at/updated_at values instead of letting auto_now(_add) overwrite them."""
+    fields = [
+        (model_field, model_field.auto_now, model_field.auto_now_add)
+        for model in models for model_field in model._meta.concrete_fields
+        if getattr(model_field, 'auto_now', False) or getattr(model_field, 'auto_now_add', False)
+    ]
+    for model_field, _, _ in fields:
+        model_field.auto_now = model_field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for model_field, auto_now, auto_now_add in fields:
+            model_field.auto_now, model_field.auto_now_add = auto_now, auto_now_add
+
+
+class Importer:
+    def __init__(self, batch_size=1000, pre_hashed=False, hash_executor=None):
+        self.batch_size = batch_size
+        self.pre_hashed = pre_hashed
+        self.hash_executor = hash_executor
+        self.user_ids = {}
+        self.blog_ids = {}
+        self.comment_ids = {}
+        self.touched_blogs = set()
+
+    def _load(self, kind, rows, build, insert):
+        report = ImportReport(kind)
+        started = time.perf_counter()
+        for batch in _batches(rows, self.batch_size):
+            built = []
+            for row in batch:
+                try:
+                    built.append((row, build(row)))
+                except (KeyError, ValueError, TypeError) as e:
+                    report.skip(kind, row, repr(e))
+            if built:
+                with transaction.atomic():
+                    # Rows the database left out, with the reason.
+                    dropped = insert(built) or []
+                for row, reason in dropped:
+                    report.skip(kind, row, reason)
+                report.loaded += len(built) - len(dropped)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def import_users(self, rows):
+        def build(row):
+            now = timezone.now()
+            user = User(
+                username=row['username'], email=row['email'], is_active=_flag(row.get('is_active'), True),
+                created_at=_timestamp(row.get('created_at'), now), updated_at=now, date_joined=now,
+            )
+            if self.pre_hashed and row.get('password_hash'):
+                identify_hasher(row['password_hash'])
+                user.password = row['password_hash']
+            elif not row.get('password'):
+                user.password = make_password(None)
+            return user
+
+        def insert(built):
+            plain = [(user, row['password']) for row, user in built if not user.password]
+            for (user, _), hashed in zip(plain, make_passwords([password for _, password in plain], self.hash_executor)):
+                user.password = hashed
+            # Usernames that already exist keep their account and are mapped to it.
+            User.objects.bulk_create([user for _, user in built], ignore_conflicts=True)
+            pks = dict(User.objects.filter(username__in=[user.username for _, user in built]).values_list('username', 'pk'))
+            for row, user in built:
+                if row.get('id') not in (None, '') and user.username in pks:
+                    self.user_ids[str(row['id'])] = pks[user.username]
+            # Any other row was dropped for a unique constraint, which leaves the email.
+            return [(row, f"email {user.email!r} belongs to another user") for row, user in built if user.username not in pks]
+
+        with keep_timestamps(User):
+            return self._load('users', rows, build, insert)
+
+    def import_blogs(self, rows):
+        def build(row):
+            now = timezone.now()
+            return Blog(
+                author_id=self.user_ids[str(row['author'])], title=row['title'], content=row['content'],
+                created_at=_timestamp(row.get('created_at'), now), updated_at=_timestamp(row.get('updated_at'), now),
+            )
+
+        def insert(built):
+            Blog.objects.bulk_create([blog for _, blog in built])
+            for row, blog in built:
+                if row.get('id') not in (None, ''):
+                    self.blog_ids[str(row['id'])] = blog.pk
+                self.touched_blogs.add(blog.pk)
+
+        # The search index is rebuilt in one pass afterwards rather than by a trigger per row.
+        search.drop_triggers(connection)
+        try:
+            with keep_timestamps(Blog):
+                return self._load('blogs', rows, build, insert)
+        finally:
+            search.install(connection)
+
+    def import_likes(self, rows):
+        def build(row):
+            now = timezone.now()
+            return Like(
+                user_id=self.user_ids[str(row['user'])], blog_id=self.blog_ids[str(row['blog'])],
+                created_at=_timestamp(row.get('created_at'), now), updated_at=now,
+            )
+
+        def insert(built):
+            Like.objects.bulk_create([like for _, like in built], ignore_conflicts=True)
+            self.touched_blogs.update(like.blog_id for _, like in built)
+
+        with keep_timestamps(Like):
+            return self._load('likes', rows, build, insert)
+
+    def import_comments(self, rows):
+        # Replies have to come after their parent in the file. Source ids of the
+        # rows built so far, their primary keys are only known once inserted.
+        built_ids = set()
+
+        def build(row):
+            now = timezone.now()
+            parent = row.get('parent')
+            if parent not in (None, '') and str(parent) not in built_ids:
+                raise KeyError(f"parent {parent}")
+            comment = Comment(
+                user_id=self.user_ids[str(row['user'])], blog_id=self.blog_ids[str(row['blog'])], content=row['content'],
+                created_at=_timestamp(row.get('created_at'), now), updated_at=_timestamp(row.get('updated_at'), now),
+            )
+            if row.get('id') not in (None, ''):
+                built_ids.add(str(row['id']))
+            return comment
+
+        def insert(built):
+            # One bulk insert per thread level present in the batch, so parents get their pk first.
+            pending = built
+            while pending:
+                level = [
+                    (row, comment) for row, comment in pending
+                    if row.get('parent') in (None, '') or str(row['parent']) in self.comment_ids
+                ]
+                for row, comment in level:
+                    if row.get('parent') not in (None, ''):
+                        comment.parent_id = self.comment_ids[str(row['parent'])]
+                Comment.objects.bulk_create([comment for _, comment in level])
+                threads.assign_paths([comment for _, comment in level])
+                for row, comment in level:
+                    if row.get('id') not in (None, ''):
+                        self.comment_ids[str(row['id'])] = comment.pk
+                pending = [(row, comment) for row, comment in pending if comment.pk is None]
+            self.touched_blogs.update(comment.blog_id for _, comment in built)
+
+        with keep_timestamps(Comment):
+            return self._load('comments', rows, build, insert)
+
+    def finish(self):
+        """Recompute counters, visibility and trending scores of every blog the import touched."""
+        blog_ids = sorted(self.touched_blogs)
+        for start in range(0, len(blog_ids), self.batch_size):
+            chunk = blog_ids[start:start + self.batch_size]
+            with transaction.atomic():
+                refresh_counters(Blog.objects.filter(pk__in=chunk))
+                visibility.refresh_visibility(chunk)
+                trending.rebuild(chunk)
+        cache.bump_list_generation()
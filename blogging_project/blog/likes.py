@@ -0,0 +1,144 @@
+"""Idempotent like and unlike, one conflict-free statement each.
+
+Liking inserts with ``ON CONFLICT DO NOTHING`` and unliking deletes
+whatever row there is, so repeated or concurrent requests never trip the
+unique constraint. Only the request that actually changed a row moves the
+counter, reading the new count back with ``RETURNING``; the others read it
+as is. Both run in one transaction and only touch visible blogs.
+
+The rows are written with raw SQL, so this does the work of the Like
+signal receivers itself.
+
+Reads get each blog's ``recent_likers`` and the viewer's ``liked_by_me``
+for a whole page of blogs at once. Only the former is part of cached
+payloads; ``liked_by_me`` is set on them per response with ``mark_liked``.
+"""
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from .models import Blog, Like
+from . import cache, events, trending
+
+_TABLES = {'like': Like._meta.db_table, 'blog': Blog._meta.db_table}
+
+_INSERT = """INSERT INTO {like} (user_id, blog_id, created_by_id, created_at, updated_at)
+    SELECT %s, id, %s, %s, %s FROM {blog} WHERE id = %s AND is_visible
+    ON CONFLICT (user_id, blog_id) DO NOTHING""".format(**_TABLES)
+_DELETE = """DELETE FROM {like}
+    WHERE user_id = %s AND blog_id = (SELECT id FROM {blog} WHERE id = %s AND is_visible)
+    RETURNING created_at""".format(**_TABLES)
+_ADJUST = """UPDATE {blog} SET likes_count = likes_count + %s, last_activity_at = %s
+    WHERE id = %s RETURNING likes_count""".format(**_TABLES)
+_COUNT = "SELECT likes_count FROM {blog} WHERE id = %s AND is_visible".format(**_TABLES)
+
+
+def _likes_count(cursor, changed, delta, now, blog_id):
+    if changed:
+        cursor.execute(_ADJUST, [delta, now, blog_id])
+    else:
+        cursor.execute(_COUNT, [blog_id])
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def like(user, blog_id):
+    """Like blog ``blog_id`` as ``user``; returns its likes count, or None when there is no such visible blog."""
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(_INSERT, [user.pk, user.created_by_id, now, now, blog_id])
+        added = cursor.rowcount > 0
+        likes_count = _likes_count(cursor, added, 1, now, blog_id)
+        if added:
+            trending.like_added(blog_id)
+            events.publish_on_commit(blog_id, 'like', {'user': user.pk})
+            cache.after_write(cache.invalidate_blog, blog_id)
+    return likes_count
+
+
+def unlike(user, blog_id):
+    """Remove the like of ``user`` from blog ``blog_id``; returns its likes count, or None when there is no such visible blog."""
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(_DELETE, [user.pk, blog_id])
+        row = cursor.fetchone()
+        likes_count = _likes_count(cursor, row, -1, connection.ops.adapt_datetimefield_value(now), blog_id)
+        if row:
+            created_at = connection.ops.convert_datetimefield_value(row[0], None, connection)
+            trending.like_removed(Like(blog_id=blog_id, created_at=created_at))
+            events.publish_on_commit(blog_id, 'unlike', {'user': user.pk})
+            cache.after_write(cache.invalidate_blog, blog_id)
+    return likes_count
+
+
+def _recent_likers(blog_ids, limit):
+    return Like.objects.filter(blog_id__in=blog_ids).annotate(
+        position=Window(RowNumber(), partition_by=F('blog_id'), order_by=[F('created_at').desc(), F('id').desc()]),
+    ).filter(position__lte=limit or settings.RECENT_LIKERS).order_by('blog_id', 'position').values_list('blog_id', 'user_id')
+
+
+def recent_likers(blog_ids, limit=None):
+    """The ids of the latest ``limit`` users to like each of ``blog_ids``, newest first, in one query."""
+    likers = {pk: [] for pk in blog_ids}
+    if likers:
+        for blog_id, user_id in _recent_likers(likers, limit):
+            likers[blog_id].append(user_id)
+    return likers
+
+
+async def arecent_likers(blog_ids, limit=None):
+    likers = {pk: [] for pk in blog_ids}
+    if likers:
+        async for blog_id, user_id in _recent_likers(likers, limit):
+            likers[blog_id].append(user_id)
+    return likers
+
+
+def _liked(user, blog_ids):
+    if not blog_ids or user is None or not user.is_authenticated:
+        return None
+    return Like.objects.filter(user_id=user.pk, blog_id__in=blog_ids).values_list('blog_id', flat=True)
+
+
+def liked_blog_ids(user, blog_ids):
+    """Which of ``blog_ids`` ``user`` likes, in one query; none for anonymous users."""
+    liked = _liked(user, blog_ids)
+    return set() if liked is None else set(liked)
+
+
+async def aliked_blog_ids(user, blog_ids):
+    liked = _liked(user, blog_ids)
+    return set() if liked is None else {blog_id async for blog_id in liked}
+
+
+def _marked(payloads, blog_ids):
+    if blog_ids is None:
+        blog_ids = [payload.get('id') for payload in payloads]
+    marked = []
+    for payload, pk in zip(payloads, blog_ids):
+        if 'liked_by_me' not in payload:
+            continue
+        if payload.get('likes_count') == 0 or payload.get('recent_likers') == []:
+            # Nobody likes the blog, there is nothing to look up.
+            payload['liked_by_me'] = False
+        else:
+            marked.append((payload, pk))
+    return marked
+
+
+def mark_liked(payloads, user, blog_ids=None):
+    """Set ``liked_by_me`` for ``user`` on the blog ``payloads`` that have it; ``blog_ids`` defaults to their ``id``."""
+    marked = _marked(payloads, blog_ids)
+    liked = liked_blog_ids(user, [pk for _, pk in marked])
+    for payload, pk in marked:
+        payload['liked_by_me'] = pk in liked
+    return payloads
+
+
+async def amark_liked(payloads, user, blog_ids=None):
+    marked = _marked(payloads, blog_ids)
+    liked = await aliked_blog_ids(user, [pk for _, pk in marked])
+    for payload, pk in marked:
+        payload['liked_by_me'] = pk in liked
+    return payloads
@@ -0,0 +1,85 @@
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+
+ENDPOINTS = [
+    ('list_blogs', 'blogs/list_blogs/'),
+    ('get_blog_by_id', 'blogs/{blog_id}/get_blog_by_id/'),
+    ('details', 'blogs/{blog_id}/details/'),
+    ('list_comments', 'blogs/{blog_id}/list_comments/'),
+    ('me', 'auth/me/'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of the sync (/api/) and async (/api/async/) read endpoints of a running server "
+        "under concurrent clients. Start the server under ASGI (e.g. `uvicorn blogging_project.asgi:application "
+        "--workers 1`) so both variants are measured on the same process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=32, help="Number of concurrent clients.")
+        parser.add_argument('--requests', type=int, default=2000, help="Requests per endpoint variant.")
+        parser.add_argument('--blog-id', type=int, help="Blog used by the detail endpoints; defaults to the newest one.")
+        parser.add_argument('--token', help="Access token for `me`; the endpoint is skipped without it.")
+        parser.add_argument('--timeout', type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        blog_id = options['blog_id'] or self._newest_blog_id(base_url, options['timeout'])
+        headers = {'Authorization': f"Bearer {options['token']}"} if options['token'] else {}
+
+        self.stdout.write(f"{'endpoint':<16}{'variant':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for name, path in ENDPOINTS:
+            if name == 'me' and not headers:
+                continue
+            path = path.format(blog_id=blog_id)
+            for variant, prefix in (('sync', '/api/'), ('async', '/api/async/')):
+                result = self._run(base_url + prefix + path, headers, options)
+                self.stdout.write(
+                    f"{name:<16}{variant:<8}{result['rps']:>10.1f}{result['p50']:>10.2f}{result['p95']:>10.2f}{result['errors']:>8}"
+                )
+
+    def _newest_blog_id(self, base_url, timeout):
+        try:
+            with urllib.request.urlopen(f"{base_url}/api/blogs/list_blogs/?page_size=1", timeout=timeout) as response:
+                payload = json.load(response)
+        except (urllib.error.URLError, ValueError) as e:
+            raise CommandError(f"Could not reach {base_url}: {e}")
+        if not payload:
+            raise CommandError("No blogs to benchmark, seed some data first.")
+        return payload['results'][0]['id']
+
+    def _run(self, url, headers, options):
+        timeout = options['timeout']
+
+        def fetch(_):
+            request = urllib.request.Request(url, headers=headers)
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+                ok = True
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return time.perf_counter() - started, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            samples = list(pool.map(fetch, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(duration for duration, ok in samples if ok)
+        quantiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else latencies * 19 or [0.0] * 19
+        return {
+            'rps': len(samples) / elapsed,
+            'p50': quantiles[9] * 1000,
+            'p95': quantiles[18] * 1000,
+            'errors': sum(1 for _, ok in samples if not ok),
+        }
@@ -0,0 +1,28 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from blogging_project import apidocs
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema once and write it to OPENAPI_SCHEMA_FILE, from where /swagger.json and the "
+        "docs UIs serve it with caching headers. Run it as part of the build, after every API change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Where to write the schema; defaults to OPENAPI_SCHEMA_FILE.")
+        parser.add_argument('--url', help="Public base URL of the API, e.g. https://api.example.com, for the schema's host.")
+        parser.add_argument('--pretty', action='store_true', help="Indent the JSON.")
+
+    def handle(self, *args, **options):
+        from drf_yasg.codecs import OpenAPICodecJson
+        schema = apidocs.generate_schema(options['url'])
+        content = OpenAPICodecJson(validators=[], pretty=options['pretty']).encode(schema)
+        output = options['output'] or settings.OPENAPI_SCHEMA_FILE
+        # Replace the file in one step so workers never serve a partial schema.
+        partial = f'{output}.tmp'
+        with open(partial, 'wb') as target:
+            target.write(content)
+        os.replace(partial, output)
+        self.stdout.write(f"Wrote {len(schema['paths'])} paths ({len(content)} bytes) to {output}")
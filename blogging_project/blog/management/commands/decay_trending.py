@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from blog import trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply time decay to the trending scores and drop the ones that faded out. "
+        "Run it periodically (e.g. every 15 minutes from cron); scores are only decayed when it runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--rebuild', action='store_true', help="Recompute all scores from recent likes and comments instead.")
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            count = trending.rebuild(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt trending scores of {count} blog(s)"))
+            return
+        decayed, dropped = trending.decay(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Decayed {decayed} score(s), dropped {dropped}"))
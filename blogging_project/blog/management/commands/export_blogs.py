@@ -0,0 +1,26 @@
+import sys
+from django.core.management.base import BaseCommand
+from blog.export import CHUNK_SIZE, iter_ndjson
+
+
+class Command(BaseCommand):
+    help = "Write every blog with its comments and like count as NDJSON, one blog per line."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', help="File to write to; defaults to stdout.")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Blogs read and prefetched per query.")
+
+    def handle(self, *args, **options):
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                count = self._write(output, options['chunk_size'])
+            self.stderr.write(self.style.SUCCESS(f"Exported {count} blog(s) to {options['output']}"))
+        else:
+            self._write(sys.stdout, options['chunk_size'])
+
+    def _write(self, output, chunk_size):
+        count = 0
+        for line in iter_ndjson(chunk_size):
+            output.write(line)
+            count += 1
+        return count
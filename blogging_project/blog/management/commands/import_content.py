@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from user_auth.hashing import process_pool
+from blog.importer import Importer, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load users, blogs, likes and comments from NDJSON or CSV files (chosen by the .csv extension). "
+        "Files are loaded in that order; `author`, `user` and `blog` columns refer to the `id` column of the "
+        "users and blogs files. Counters, trending scores and the search index are rebuilt at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', help="Rows with id, username, email and password (or password_hash).")
+        parser.add_argument('--blogs', help="Rows with id, author, title, content and optional created_at/updated_at.")
+        parser.add_argument('--likes', help="Rows with user and blog.")
+        parser.add_argument('--comments', help="Rows with user, blog, content and optional created_at/updated_at.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk insert and transaction.")
+        parser.add_argument('--pre-hashed', action='store_true',
+                            help="Store `password_hash` values as they are instead of hashing `password`.")
+        parser.add_argument('--hash-workers', type=int, default=settings.PASSWORD_HASHING_WORKERS,
+                            help="Processes hashing plain-text passwords; 0 hashes inline.")
+
+    def handle(self, *args, **options):
+        kinds = [kind for kind in ('users', 'blogs', 'likes', 'comments') if options[kind]]
+        if not kinds:
+            raise CommandError("Nothing to import, pass at least one of --users, --blogs, --likes, --comments.")
+        executor = process_pool(options['hash_workers']) if options['users'] and options['hash_workers'] > 0 else None
+        importer = Importer(batch_size=options['batch_size'], pre_hashed=options['pre_hashed'], hash_executor=executor)
+        try:
+            for kind in kinds:
+                report = getattr(importer, f'import_{kind}')(read_rows(options[kind]))
+                self.stdout.write(
+                    f"{kind:<10}{report.loaded:>10} loaded{report.skipped:>8} skipped"
+                    f"{report.seconds:>9.1f}s{report.rate:>11.0f} rows/s"
+                )
+                for error in report.errors:
+                    self.stderr.write(f"  {error}")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        importer.finish()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {len(importer.touched_blogs)} blog(s)"))
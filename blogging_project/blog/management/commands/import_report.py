@@ -0,0 +1,69 @@
+import json
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter, as a worker does before serving its first request.
+BOOT = """
+import json, os, sys, time
+started = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', {settings_module!r})
+from django.core.{handler} import get_{handler}_application
+get_{handler}_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({{'seconds': time.perf_counter() - started, 'loaded': [name for name in {watch!r} if name in sys.modules]}}))
+"""
+
+# Modules a worker should only load once it serves something that needs them.
+WATCHED = ('drf_yasg.openapi', 'drf_yasg.views', 'drf_yasg.inspectors')
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the cold start of a worker process: boot Django and load the URLconf in a fresh interpreter "
+        "under `python -X importtime` and report the slowest packages. Use --json to track it over time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi')
+        parser.add_argument('--top', type=int, default=15, help="Number of packages to list.")
+        parser.add_argument('--json', action='store_true', help="Print a single JSON object instead of a table.")
+
+    def handle(self, *args, **options):
+        code = BOOT.format(settings_module=settings.SETTINGS_MODULE, handler=options['server'], watch=WATCHED)
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "Worker boot failed.")
+        boot = json.loads(result.stdout.strip().splitlines()[-1])
+        packages = {}
+        modules = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, _, name = line[len('import time:'):].split('|', 2)
+            package = packages.setdefault(name.strip().split('.')[0], {'modules': 0, 'ms': 0.0})
+            package['modules'] += 1
+            package['ms'] += int(self_us) / 1000
+            modules += 1
+        slowest = sorted(packages.items(), key=lambda item: item[1]['ms'], reverse=True)[:options['top']]
+        report = {
+            'server': options['server'],
+            'boot_ms': round(boot['seconds'] * 1000, 1),
+            'import_ms': round(sum(package['ms'] for package in packages.values()), 1),
+            'modules': modules,
+            'deferred_loaded': boot['loaded'],
+            'packages': [{'package': name, 'modules': row['modules'], 'ms': round(row['ms'], 1)} for name, row in slowest],
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(report))
+            return
+        self.stdout.write(
+            f"{report['server']} worker boot: {report['boot_ms']} ms, {report['modules']} modules imported "
+            f"in {report['import_ms']} ms"
+        )
+        self.stdout.write(f"Deferred modules loaded: {', '.join(report['deferred_loaded']) or 'none'}")
+        self.stdout.write(f"{'package':<28}{'modules':>8}{'ms':>10}")
+        for row in report['packages']:
+            self.stdout.write(f"{row['package']:<28}{row['modules']:>8}{row['ms']:>10.1f}")
@@ -0,0 +1,142 @@
+import json
+import statistics
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from blog.perf import SEED_PASSWORD, iter_routes, route_path, seed_dataset
+
+
+class Rollback(Exception):
+    pass
+
+
+def request_body(action, dataset, iteration, refresh_token):
+    blog_ids = [blog.pk for blog in dataset.blogs[:20]]
+    bodies = {
+        'create_blog': {'title': f'Benchmark create {iteration}', 'content': 'Created by perf_benchmark'},
+        'update_blog': {'title': f'Benchmark update {iteration}'},
+        'comment_blog': {'content': f'Benchmark comment {iteration}'},
+        'update_comment': {'content': f'Benchmark edit {iteration}'},
+        'bulk_like': {'blog_ids': blog_ids},
+        'bulk_unlike': {'blog_ids': blog_ids},
+        'bulk_comment': {'comments': [{'blog': pk, 'content': 'Benchmark bulk comment'} for pk in blog_ids]},
+        'register': {'username': f'benchreg{iteration}', 'email': f'benchreg{iteration}@example.com', 'password': SEED_PASSWORD},
+        'create_superuser': {'username': f'benchsu{iteration}', 'email': f'benchsu{iteration}@example.com', 'password': SEED_PASSWORD},
+        'login': {'username': dataset.admin.username, 'password': SEED_PASSWORD},
+        'refresh': {'refresh': refresh_token},
+    }
+    return bodies.get(action)
+
+
+# Open-ended streams never finish a request.
+SKIPPED_ROUTES = {'async-blog-events'}
+
+QUERY_PARAMS = {
+    'search': {'q': 'sqlite django'},
+}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset, drive every route of the root URLconf through the test client and report "
+        "p50/p95 latency, SQL query count and payload size per endpoint. The data is rolled back afterwards "
+        "unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--blogs', type=int, default=200)
+        parser.add_argument('--likes', type=int, default=20, help="Average likes per blog.")
+        parser.add_argument('--comments', type=int, default=10, help="Average comments per blog.")
+        parser.add_argument('--skew', type=float, default=1.0, help="Zipf exponent of blog popularity, 0 for uniform.")
+        parser.add_argument('--iterations', type=int, default=20, help="Requests per endpoint.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--cold', action='store_true', help="Clear the blog cache before every request.")
+        parser.add_argument('--only', nargs='*', help="Only run these actions or route names.")
+        parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+        parser.add_argument('--keep', action='store_true', help="Commit the seeded data instead of rolling it back.")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic(), override_settings(
+                ALLOWED_HOSTS=['testserver'], WRITE_THROTTLE_USER_RATE=None, WRITE_THROTTLE_GLOBAL_RATE=None,
+            ):
+                results = self._benchmark(options)
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            pass
+        self._report(results, options['json'])
+
+    def _benchmark(self, options):
+        started = time.perf_counter()
+        dataset = seed_dataset(
+            users=options['users'], blogs=options['blogs'], likes=options['likes'], comments=options['comments'],
+            skew=options['skew'], spare_blogs=options['iterations'], seed=options['seed'],
+        )
+        self.stderr.write(f"Seeded dataset in {time.perf_counter() - started:.1f}s")
+
+        refresh = RefreshToken.for_user(dataset.admin)
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        blog_cache = caches[settings.BLOG_CACHE_ALIAS]
+        results = []
+        for route in iter_routes():
+            if route.name in SKIPPED_ROUTES:
+                continue
+            if options['only'] and route.action not in options['only'] and route.name not in options['only']:
+                continue
+            latencies, queries, sizes, statuses = [], [], [], Counter()
+            for iteration in range(options['iterations']):
+                values = {
+                    'pk': dataset.spare_blogs[iteration].pk if route.action == 'delete_blog' else dataset.blog.pk,
+                    'comment_id': dataset.comment.pk,
+                    'author_id': dataset.admin.pk,
+                    'format': '.json',
+                }
+                body = request_body(route.action, dataset, iteration, str(refresh))
+                send = getattr(client, route.method)
+                if options['cold']:
+                    blog_cache.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    request_started = time.perf_counter()
+                    if body is None:
+                        response = send(route_path(route, values), QUERY_PARAMS.get(route.action))
+                    else:
+                        response = send(route_path(route, values), body, content_type='application/json')
+                    content = b''.join(response.streaming_content) if response.streaming else response.content
+                    latencies.append(time.perf_counter() - request_started)
+                queries.append(len(captured))
+                sizes.append(len(content))
+                statuses[response.status_code] += 1
+            results.append({
+                'endpoint': f'{route.method.upper()} {route.name}',
+                'action': route.action,
+                'status': dict(statuses),
+                'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+                'queries': max(queries),
+                'bytes': int(statistics.median(sizes)),
+            })
+        return results
+
+    def _report(self, results, as_json):
+        if as_json:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'endpoint':<42}{'status':<12}{'p50 ms':>9}{'p95 ms':>9}{'queries':>9}{'bytes':>10}")
+        for row in results:
+            status = ','.join(str(code) for code in sorted(row['status']))
+            self.stdout.write(
+                f"{row['endpoint']:<42}{status:<12}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['queries']:>9}{row['bytes']:>10}"
+            )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+from blog import search
+
+
+class Command(BaseCommand):
+    help = "Recreate the FTS5 blog search table and triggers if needed, then rebuild the index from blog_blog."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--optimize', action='store_true', help="Merge index segments after rebuilding.")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            self.stderr.write("Full-text search is only available on SQLite.")
+            return
+        search.install(connection)
+        search.rebuild(connection)
+        if options['optimize']:
+            search.optimize(connection)
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from blog.models import Blog
+from blog.counters import drifted_blogs, refresh_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized like/comment counters on blogs that have drifted from the real row counts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Only report the drifted blogs.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        drifted = list(drifted_blogs().values_list('id', flat=True))
+        self.stdout.write(f"{len(drifted)} blog(s) with drifted counters")
+        if options['dry_run'] or not drifted:
+            return
+        for start in range(0, len(drifted), batch_size):
+            refresh_counters(Blog.objects.filter(pk__in=drifted[start:start + batch_size]))
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {len(drifted)} blog(s)"))
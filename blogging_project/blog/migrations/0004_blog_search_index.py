@@ -0,0 +1,25 @@
+from django.db import migrations
+from blog import search
+
+
+def create_search_index(apps, schema_editor):
+    search.install(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for trigger in ('ai', 'ad', 'au'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {search.FTS_TABLE}_{trigger}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {search.FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_author_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='views_count',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def hide_inactive_authors(apps, schema_editor):
+    Blog = apps.get_model('blog', 'Blog')
+    Comment = apps.get_model('blog', 'Comment')
+    Blog.objects.filter(author__is_active=False).update(is_visible=False)
+    Comment.objects.filter(user__is_active=False).update(is_visible=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_comment_threads'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blog',
+            name='blog_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_blog_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_blog_path_idx',
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='is_visible',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='is_visible',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(hide_inactive_authors, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['is_visible', '-created_at', '-id'], name='blog_visible_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['blog', 'is_visible', '-created_at', '-id'], name='comment_visible_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['blog', 'is_visible', 'path'], name='comment_visible_path_idx'),
+        ),
+    ]
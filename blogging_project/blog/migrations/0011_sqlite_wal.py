@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def enable_wal(apps, schema_editor):
+    # The journal mode is stored in the database file, so this runs once
+    # rather than on every connection. It cannot change inside a transaction.
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('PRAGMA journal_mode=WAL')
+
+
+def disable_wal(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('PRAGMA journal_mode=DELETE')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('blog', '0010_visibility_flags'),
+    ]
+
+    operations = [
+        migrations.RunPython(enable_wal, disable_wal),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_sqlite_wal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blog',
+            name='blog_visible_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_visible_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_visible_path_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['-created_at', '-id'], name='blog_visible_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['blog', '-created_at', '-id'], name='comment_visible_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['blog', 'path'], name='comment_visible_path_idx'),
+        ),
+    ]
@@ -5,6 +5,21 @@ class Blog(BaseModel):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="blogs")
     title = models.CharField(max_length=255)
     content = models.TextField()
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    # Approximate, written in batches by blog.viewcounts.
+    views_count = models.PositiveBigIntegerField(default=0)
+    # Last like/comment change, used with updated_at for HTTP validators.
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    # Mirrors author.is_active so reads need no join, maintained by blog.visibility.
+    is_visible = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            # Partial, SQLite cannot use the bare "is_visible" filter Django emits as an index equality.
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_visible=True), name='blog_visible_created_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='blog_author_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -19,7 +34,31 @@ class Like(BaseModel):
 class Comment(BaseModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="comments")
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name="replies")
     content = models.TextField()
+    # Materialized path of ids from the thread root down to this comment, see blog.threads.
+    path = models.TextField(blank=True, default='', editable=False)
+    # Mirrors user.is_active so reads need no join, maintained by blog.visibility.
+    is_visible = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['blog', '-created_at', '-id'], condition=models.Q(is_visible=True), name='comment_visible_created_idx'),
+            models.Index(fields=['blog', 'path'], condition=models.Q(is_visible=True), name='comment_visible_path_idx'),
+        ]
 
     def __str__(self):
         return self.content
+
+
+class TrendingScore(models.Model):
+    """Time-decayed like/comment activity of a blog, maintained by ``blog.trending``."""
+    blog = models.OneToOneField(Blog, on_delete=models.CASCADE, primary_key=True, related_name="trending")
+    score = models.FloatField(default=0)
+    # Time the score was last decayed to; activity since then is added undecayed.
+    decayed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score'], name='trending_score_idx'),
+        ]
@@ -0,0 +1,115 @@
+"""Dataset seeding and route discovery for the performance benchmark and query-budget tests."""
+import random
+from dataclasses import dataclass, field
+from django.contrib.auth.hashers import make_password
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from user_auth.models import User
+from .models import Blog, Like, Comment
+from .counters import refresh_counters
+from . import threads, trending
+
+SEED_PASSWORD = 'benchmark-password'
+
+
+@dataclass
+class Dataset:
+    users: list
+    blogs: list
+    admin: User
+    blog: Blog
+    comment: Comment
+    spare_blogs: list = field(default_factory=list)
+
+
+def _skewed_counts(total, buckets, skew, rng):
+    # Zipf-like popularity: bucket i gets a share proportional to 1 / (i + 1) ** skew.
+    weights = [1 / (rank + 1) ** skew for rank in range(buckets)]
+    counts = [0] * buckets
+    for index in rng.choices(range(buckets), weights=weights, k=total):
+        counts[index] += 1
+    return counts
+
+
+def seed_dataset(users=50, blogs=200, likes=20, comments=10, skew=1.0, spare_blogs=0, seed=42, batch_size=1000):
+    """Create ``users`` users and ``blogs`` blogs with ``likes``/``comments`` per blog on average.
+
+    Popularity follows a Zipf-like distribution controlled by ``skew`` (0 is
+    uniform). The first user is a superuser who authors the most popular blog
+    and its first comment, so every endpoint has something to act on.
+    ``spare_blogs`` extra blogs owned by that user are returned for
+    destructive endpoints.
+    """
+    rng = random.Random(seed)
+    password = make_password(SEED_PASSWORD)
+    start = User.objects.count()
+    people = User.objects.bulk_create([
+        User(username=f'bench{start + i}', email=f'bench{start + i}@example.com', password=password,
+             is_staff=i == 0, is_superuser=i == 0)
+        for i in range(users)
+    ], batch_size=batch_size)
+    admin = people[0]
+
+    posts = Blog.objects.bulk_create([
+        Blog(author=admin if i == 0 or i >= blogs else rng.choice(people), title=f'Benchmark post {i}',
+             content=' '.join(rng.choice(('lorem', 'ipsum', 'dolor', 'sit', 'amet', 'sqlite', 'django')) for _ in range(200)))
+        for i in range(blogs + spare_blogs)
+    ], batch_size=batch_size)
+    posts, spares = posts[:blogs], posts[blogs:]
+
+    like_rows = []
+    for post, count in zip(posts, _skewed_counts(likes * blogs, blogs, skew, rng)):
+        like_rows.extend(Like(user=user, blog=post) for user in rng.sample(people, min(count, users)))
+    Like.objects.bulk_create(like_rows, batch_size=batch_size)
+
+    comment_rows = [Comment(user=admin, blog=posts[0], content='First!')]
+    for post, count in zip(posts, _skewed_counts(comments * blogs, blogs, skew, rng)):
+        comment_rows.extend(Comment(user=rng.choice(people), blog=post, content=f'Comment {n}') for n in range(count))
+    comment_rows = Comment.objects.bulk_create(comment_rows, batch_size=batch_size)
+    threads.assign_paths(comment_rows, batch_size=batch_size)
+
+    refresh_counters(Blog.objects.filter(pk__in=[post.pk for post in posts]))
+    trending.rebuild([post.pk for post in posts])
+    return Dataset(users=people, blogs=posts, admin=admin, blog=posts[0], comment=comment_rows[0], spare_blogs=spares)
+
+
+@dataclass
+class Route:
+    name: str
+    method: str
+    action: str
+    kwargs: tuple
+
+
+def iter_routes(skip_namespaces=('admin',)):
+    """Yield every named route of the root URLconf with its HTTP methods.
+
+    ViewSet routes expand to one Route per mapped method, other views are
+    treated as GET. Format-suffix duplicates of a route are skipped.
+    """
+    def walk(patterns, namespace):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                if pattern.namespace in skip_namespaces:
+                    continue
+                child = f'{namespace}:{pattern.namespace}' if namespace and pattern.namespace else pattern.namespace or namespace
+                yield from walk(pattern.url_patterns, child)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                kwargs = tuple(pattern.pattern.regex.groupindex)
+                name = f'{namespace}:{pattern.name}' if namespace else pattern.name
+                actions = getattr(pattern.callback, 'actions', None) or {'get': pattern.name}
+                # DRF adds an implicit 'head' mapping on first dispatch, snapshot before requests run.
+                for method, action in list(actions.items()):
+                    if method in ('head', 'options'):
+                        continue
+                    yield Route(name=name, method=method, action=action, kwargs=kwargs)
+
+    seen = set()
+    for route in walk(get_resolver().url_patterns, None):
+        key = (route.name, route.method)
+        if key not in seen:
+            seen.add(key)
+            yield route
+
+
+def route_path(route, values):
+    return reverse(route.name, kwargs={name: values[name] for name in route.kwargs})
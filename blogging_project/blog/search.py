@@ -0,0 +1,105 @@
+import html
+import re
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from .models import Blog
+
+FTS_TABLE = 'blog_blog_fts'
+# Placed around matches by snippet(), replaced by <mark> once the text is escaped.
+MATCH_START, MATCH_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+
+_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content, content='blog_blog', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON blog_blog BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON blog_blog BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    # Only title/content changes touch the index, counter updates do not.
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, content ON blog_blog BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+_TRIGGERS = (f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au')
+
+
+def install(using=connection):
+    """Create the FTS5 table and its sync triggers if missing.
+
+    SQLite drops triggers when Django remakes ``blog_blog`` during a
+    migration, so this also runs after every ``migrate`` and rebuilds the
+    index whenever triggers had to be recreated.
+    """
+    if using.vendor != 'sqlite':
+        return
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)", _TRIGGERS
+        )
+        missing = cursor.fetchone()[0] < len(_TRIGGERS)
+        for statement in _STATEMENTS:
+            cursor.execute(statement)
+    if missing:
+        rebuild(using)
+
+
+def drop_triggers(using=connection):
+    """Stop maintaining the index row by row, e.g. around a bulk load; ``install`` restores and rebuilds it."""
+    if using.vendor != 'sqlite':
+        return
+    with using.cursor() as cursor:
+        for trigger in _TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+
+def rebuild(using=connection):
+    with using.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def optimize(using=connection):
+    with using.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def match_expression(query):
+    # Quote every term so user input can never be parsed as FTS5 syntax.
+    terms = re.findall(r'\w+', query)
+    return ' '.join('"%s"' % term for term in terms)
+
+
+def _fts(select, expression):
+    # Correlated to the outer blog row; FTS5 seeks straight to the rowid within the match.
+    return RawSQL(
+        f'SELECT {select} FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = "{Blog._meta.db_table}"."id"',
+        [expression],
+    )
+
+
+def search_blogs(queryset, query):
+    """Filter ``queryset`` to blogs matching ``query``, best BM25 rank first.
+
+    Rows are annotated with ``rank`` (lower is better) and a ``snippet`` of
+    raw text with matches between MATCH_START and MATCH_END, see
+    ``highlight``. Title hits weigh ten times more than content hits.
+    """
+    expression = match_expression(query)
+    if not expression:
+        return queryset.none()
+    matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [expression])
+    return queryset.filter(pk__in=matches).annotate(
+        rank=_fts(f'bm25({FTS_TABLE}, 10.0, 1.0)', expression),
+        snippet=_fts(f"snippet({FTS_TABLE}, -1, '{MATCH_START}', '{MATCH_END}', '…', {SNIPPET_TOKENS})", expression),
+    ).order_by('rank', '-created_at')
+
+
+def highlight(snippet):
+    """HTML of a ``search_blogs`` snippet: the blog text escaped, matches in ``<mark>``."""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
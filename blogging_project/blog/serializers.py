@@ -1,25 +1,109 @@
+from django.conf import settings
 from rest_framework import serializers
+from blogging_project.instrumentation import TimedSerializerMixin
+from django.db.models.manager import BaseManager
 from .models import Blog, Like, Comment
+from . import likes, search, threads
 
-class BlogSerializer(serializers.ModelSerializer):
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+def excerpt(text, length):
+    """``text`` cut to at most ``length`` characters, at a word boundary when there is one nearby."""
+    if text is None or len(text) <= length:
+        return text
+    cut = text[:length]
+    space = cut.rfind(' ')
+    return (cut[:space] if space > length // 2 else cut).rstrip() + '…'
+
+
+class ExcerptField(serializers.Field):
+    """Excerpt of the blog content, from a ``content_excerpt`` annotation when the queryset provides one."""
+
+    def __init__(self, length, **kwargs):
+        self.length = length
+        super().__init__(source='*', read_only=True, **kwargs)
+
+    def to_representation(self, obj):
+        content = getattr(obj, 'content_excerpt', None)
+        return excerpt(obj.content if content is None else content, self.length)
+
+
+class SparseFieldsMixin:
+    """Accepts ``fields``, the names of the declared fields to render (all when None)."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def _may_have_likes(blog):
+    return 'likes_count' in blog.get_deferred_fields() or blog.likes_count > 0
+
+
+def load_likes(serializer, blogs):
+    """``(recent_likers, liked_by_me)`` of every blog in ``blogs``, loaded into the context with one query each.
+
+    ``liked_by_me`` is for the user of the context's request, False without
+    one. Blogs without likes need neither query.
+    """
+    loaded = serializer.context.setdefault('likes', {})
+    missing = [blog.pk for blog in blogs if blog.pk not in loaded and _may_have_likes(blog)]
+    if missing:
+        request = serializer.context.get('request')
+        recent = likes.recent_likers(missing) if 'recent_likers' in serializer.fields else {}
+        liked = likes.liked_blog_ids(request and request.user, missing) if 'liked_by_me' in serializer.fields else set()
+        for pk in missing:
+            loaded[pk] = (recent.get(pk, []), pk in liked)
+    for blog in blogs:
+        loaded.setdefault(blog.pk, ([], False))
+    return loaded
+
+
+async def aload_likes(blogs):
+    """Serializer context with the ``recent_likers`` of ``blogs`` loaded, for async views where ``load_likes`` cannot query."""
+    recent = await likes.arecent_likers([blog.pk for blog in blogs if _may_have_likes(blog)])
+    return {'likes': {blog.pk: (recent.get(blog.pk, []), False) for blog in blogs}}
+
+
+class BlogListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        blogs = list(data.all() if isinstance(data, BaseManager) else data)
+        load_likes(self.child, blogs)
+        return super().to_representation(blogs)
+
+
+class BlogLikesFieldsMixin:
+    """Getters of the ``recent_likers`` and ``liked_by_me`` fields, batched per page by ``BlogListSerializer``."""
+
+    def get_recent_likers(self, obj):
+        return load_likes(self, [obj])[obj.pk][0]
+
+    def get_liked_by_me(self, obj):
+        return load_likes(self, [obj])[obj.pk][1]
+
+
+class BlogSerializer(BlogLikesFieldsMixin, SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
+    recent_likers = serializers.SerializerMethodField()
+    liked_by_me = serializers.SerializerMethodField()
 
     class Meta:
         model = Blog
-        fields = ['id', 'author', 'title', 'content', 'created_at', 'updated_at', 'likes_count', 'comments_count', 'created_by']
-        read_only_fields = ['author', 'created_by']
-
-    def get_likes_count(self, obj):
-        return Like.objects.filter(blog=obj).count()
+        fields = [
+            'id', 'author', 'title', 'content', 'created_at', 'updated_at', 'likes_count', 'comments_count', 'views_count',
+            'recent_likers', 'liked_by_me', 'created_by',
+        ]
+        read_only_fields = ['author', 'created_by', 'likes_count', 'comments_count', 'views_count']
+        list_serializer_class = BlogListSerializer
 
-    def get_comments_count(self, obj):
-        return Comment.objects.filter(blog=obj).count()
+    def __init__(self, *args, excerpt_length=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if excerpt_length:
+            self.fields['excerpt'] = ExcerptField(excerpt_length)
 
     def create(self, validated_data):
         validated_data['author'] = self.context['request'].user
-        validated_data['created_by'] = self.context['request'].user.created_by
+        validated_data['created_by_id'] = self.context['request'].user.created_by_id
         return Blog.objects.create(**validated_data)
 
     def update(self, instance, validated_data):
@@ -29,17 +113,30 @@ class BlogSerializer(serializers.ModelSerializer):
         return instance
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
+    parent = serializers.PrimaryKeyRelatedField(queryset=Comment.objects.all(), required=False, allow_null=True)
+    depth = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
-        fields = ['id', 'user', 'content', 'created_at', 'created_by']
+        fields = ['id', 'user', 'parent', 'depth', 'content', 'created_at', 'created_by']
         read_only_fields = ['user', 'created_by']
 
+    def get_depth(self, obj):
+        return threads.depth(obj.path)
+
+    def validate_parent(self, parent):
+        if self.instance is not None and parent != self.instance.parent:
+            raise serializers.ValidationError("A comment cannot be moved to another thread.")
+        blog = self.context.get('blog')
+        if parent is not None and blog is not None and parent.blog_id != blog.pk:
+            raise serializers.ValidationError("The parent comment belongs to another blog.")
+        return parent
+
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
-        validated_data['created_by'] = self.context['request'].user.created_by
+        validated_data['created_by_id'] = self.context['request'].user.created_by_id
         validated_data['blog'] = self.context['blog']
         return Comment.objects.create(**validated_data)
 
@@ -50,7 +147,19 @@ class CommentSerializer(serializers.ModelSerializer):
         return instance
 
 
-class LikeSerializer(serializers.ModelSerializer):
+class ThreadedCommentSerializer(CommentSerializer):
+    """A top-level comment with the first replies of its thread, see ``threads.attach_replies``."""
+    replies_count = serializers.IntegerField(read_only=True)
+    replies = serializers.SerializerMethodField()
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ['replies_count', 'replies']
+
+    def get_replies(self, obj):
+        return CommentSerializer(obj.thread_replies, many=True).data
+
+
+class LikeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
@@ -60,7 +169,7 @@ class LikeSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
-        validated_data['created_by'] = self.context['request'].user.created_by
+        validated_data['created_by_id'] = self.context['request'].user.created_by_id
         return Like.objects.create(**validated_data)
 
     def update(self, instance, validated_data):
@@ -70,26 +179,64 @@ class LikeSerializer(serializers.ModelSerializer):
         return instance
 
 
-class BlogDetailSerializer(serializers.ModelSerializer):
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+class BlogDetailSerializer(BlogLikesFieldsMixin, SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     latest_comments = serializers.SerializerMethodField()
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
+    recent_likers = serializers.SerializerMethodField()
+    liked_by_me = serializers.SerializerMethodField()
 
     class Meta:
         model = Blog
         fields = [
             'id', 'author', 'title', 'content',
             'created_at', 'updated_at',
-            'likes_count', 'comments_count', 'latest_comments', 'created_by'
+            'likes_count', 'comments_count', 'views_count', 'recent_likers', 'liked_by_me', 'latest_comments', 'created_by'
         ]
+        read_only_fields = ['likes_count', 'comments_count', 'views_count']
+        list_serializer_class = BlogListSerializer
 
-    def get_likes_count(self, obj):
-        return Like.objects.filter(blog=obj).count()
-
-    def get_comments_count(self, obj):
-        return Comment.objects.filter(blog=obj).count()
+    def __init__(self, *args, excerpt_length=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if excerpt_length:
+            self.fields['excerpt'] = ExcerptField(excerpt_length)
 
     def get_latest_comments(self, obj):
-        latest = Comment.objects.filter(blog=obj).order_by('-created_at')[:5]
-        return CommentSerializer(latest, many=True).data
+        latest = self.context.get('latest_comments')
+        if latest is None:
+            latest = Comment.objects.filter(blog=obj).order_by('-created_at')[:5]
+        serializer_class = ThreadedCommentSerializer if self.context.get('threaded') else CommentSerializer
+        return serializer_class(latest, many=True).data
+
+
+class BlogSearchSerializer(BlogSerializer):
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.SerializerMethodField()
+
+    class Meta(BlogSerializer.Meta):
+        fields = BlogSerializer.Meta.fields + ['rank', 'snippet']
+
+    def get_snippet(self, obj):
+        return search.highlight(obj.snippet)
+
+
+class TrendingBlogSerializer(BlogSerializer):
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(BlogSerializer.Meta):
+        fields = BlogSerializer.Meta.fields + ['score']
+
+
+class BulkBlogIdsSerializer(TimedSerializerMixin, serializers.Serializer):
+    blog_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=settings.BULK_MAX_ITEMS)
+
+
+class BulkCommentItemSerializer(CommentSerializer):
+    """One item of a bulk comment; ``bulk.bulk_comment`` resolves the parents of all items in one query."""
+    parent = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_parent(self, parent):
+        return parent
+
+
+class BulkCommentSerializer(TimedSerializerMixin, serializers.Serializer):
+    comments = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=settings.BULK_MAX_ITEMS)
@@ -0,0 +1,81 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from user_auth.models import User
+from .models import Blog, Like, Comment
+from .counters import adjust_counters
+from . import cache, threads, trending, visibility
+
+
+def _deleting_blog(origin):
+    # The blog row itself is going away, there is no counter left to maintain.
+    return isinstance(origin, Blog)
+
+
+@receiver(post_save, sender=Blog)
+def blog_saved(sender, instance, **kwargs):
+    cache.after_write(cache.invalidate_blog, instance.pk)
+    cache.after_write(cache.invalidate_author, instance.author_id)
+
+
+@receiver(post_delete, sender=Blog)
+def blog_deleted(sender, instance, **kwargs):
+    cache.after_write(cache.invalidate_blog, instance.pk)
+    cache.after_write(cache.invalidate_author, instance.author_id)
+
+
+@receiver(post_save, sender=Like)
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(instance.blog_id, likes=1)
+        trending.like_added(instance.blog_id)
+        cache.after_write(cache.invalidate_blog, instance.blog_id)
+
+
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleting_blog(origin):
+        adjust_counters(instance.blog_id, likes=-1)
+        trending.like_removed(instance)
+        cache.after_write(cache.invalidate_blog, instance.blog_id)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    adjust_counters(instance.blog_id, comments=1 if created else 0)
+    if created:
+        if not instance.path:
+            threads.assign_paths([instance])
+        trending.comment_added(instance.blog_id)
+    cache.after_write(cache.invalidate_blog, instance.blog_id)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleting_blog(origin):
+        adjust_counters(instance.blog_id, comments=-1)
+        trending.comment_removed(instance)
+        cache.after_write(cache.invalidate_blog, instance.blog_id)
+
+
+@receiver(pre_save, sender=User)
+def remember_user_activity(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or (update_fields is not None and 'is_active' not in update_fields):
+        instance._was_active = instance.is_active
+    elif getattr(instance, '_loaded_is_active', None) is not None:
+        instance._was_active = instance._loaded_is_active
+    else:
+        # Not loaded from the database, or loaded without is_active.
+        instance._was_active = sender.objects.filter(pk=instance.pk).values_list('is_active', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def user_activity_changed(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is None or 'is_active' in update_fields:
+        instance._loaded_is_active = instance.is_active
+    if created or getattr(instance, '_was_active', instance.is_active) == instance.is_active:
+        return
+    # Blogs by the user disappear or come back, and so do their comments on other blogs.
+    blog_ids = visibility.set_user_visibility(instance)
+    cache.after_write(cache.invalidate_blogs, blog_ids)
+    cache.after_write(cache.invalidate_author, instance.pk)
+    cache.after_write(cache.bump_list_generation)
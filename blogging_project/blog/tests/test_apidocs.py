@@ -0,0 +1,19 @@
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+
+class OpenAPISchemaTests(TestCase):
+    def test_built_schema_is_served_with_validators(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(OPENAPI_SCHEMA_FILE=os.path.join(directory, 'openapi.json')):
+            call_command('build_openapi_schema', stdout=io.StringIO())
+            response = self.client.get('/swagger.json')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('/blogs/{id}/list_comments/', json.loads(response.content)['paths'])
+            self.assertIn('public', response['Cache-Control'])
+            self.assertEqual(self.client.get('/swagger.json', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+            self.assertEqual(self.client.get('/swagger/').status_code, 200)
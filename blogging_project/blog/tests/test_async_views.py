@@ -0,0 +1,38 @@
+import json
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..models import Blog
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class AsyncViewTests(QueryBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.headers = {'Authorization': f'Bearer {RefreshToken.for_user(self.dataset.admin).access_token}'}
+
+    async def assertSameAsSync(self, path, data=None):
+        response = await self.async_client.get(f'/api/async/{path}', data, headers=self.headers)
+        expected = await sync_to_async(self.client.get)(f'/api/{path}', data)
+        self.assertEqual(response.status_code, expected.status_code)
+        if response.status_code == 200:
+            # Page links point back at the endpoint that was called.
+            self.assertEqual(json.loads(response.content.replace(b'/api/async/', b'/api/')), json.loads(expected.content))
+
+    async def test_async_reads_match_the_sync_views(self):
+        blog = self.dataset.blog
+        hidden = self.dataset.blogs[-1]
+        await Blog.objects.filter(pk=hidden.pk).aupdate(is_visible=False)
+        for path, data in (
+            ('blogs/list_blogs/', None),
+            ('blogs/list_blogs/', {'page': 2, 'page_size': 7}),
+            ('blogs/list_blogs/', {'page': 99}),
+            (f'blogs/{blog.pk}/get_blog_by_id/', None),
+            (f'blogs/{blog.pk}/details/', None),
+            (f'blogs/{blog.pk}/list_comments/', {'page': 2, 'page_size': 3}),
+            (f'blogs/{hidden.pk}/get_blog_by_id/', None),
+            (f'blogs/{hidden.pk}/details/', None),
+            ('blogs/0/details/', None),
+            ('auth/me/', None),
+        ):
+            with self.subTest(path=path, data=data):
+                await self.assertSameAsSync(path, data)
@@ -0,0 +1,167 @@
+from django.core.cache import caches
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from ..models import Blog
+from ..counters import drifted_blogs
+from .. import cache
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class BlogQueryBudgetTests(QueryBudgetTestCase):
+    def test_list_blogs(self):
+        self.assertQueryBudget(6, 'get', '/api/blogs/list_blogs/')
+
+    def test_list_blogs_cursor(self):
+        self.assertQueryBudget(4, 'get', '/api/blogs/list_blogs/', {'pagination': 'cursor'})
+
+    def test_list_blogs_does_not_scale_with_page_size(self):
+        self.client.get('/api/auth/me/')
+        # The newest blogs have no likes yet, which would skip the like lookups on the small page.
+        for blog in self.dataset.blogs[-2:]:
+            self.client.post(f'/api/blogs/{blog.pk}/like_blog/')
+        small = self.assertQueryBudget(5, 'get', '/api/blogs/list_blogs/', {'page_size': 2})
+        caches[settings.BLOG_CACHE_ALIAS].clear()
+        large = self.assertQueryBudget(5, 'get', '/api/blogs/list_blogs/', {'page_size': 30})
+        self.assertEqual(small, large)
+
+    def test_sparse_fieldsets(self):
+        self.client.get('/api/auth/me/')
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/api/blogs/list_blogs/', {'fields': 'id,title', 'excerpt': 20})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'excerpt'})
+        self.assertLessEqual(len(response.data['results'][0]['excerpt']), 21)
+        # Only the excerpt prefix of the content is read.
+        columns = captured[-1]['sql'].split(' FROM ')[0]
+        self.assertIn('SUBSTR("blog_blog"."content", 1, 21)', columns)
+        self.assertEqual(columns.count('"blog_blog"."content"'), 1)
+
+        path = f'/api/blogs/{self.dataset.blog.pk}/'
+        self.assertEqual(set(self.client.get(path + 'list_comments/', {'exclude': 'content'}).data['results'][0]),
+                         {'id', 'user', 'parent', 'depth', 'created_at', 'created_by'})
+        full = self.client.get(path + 'details/').data
+        self.assertQueryBudget(1, 'get', path + 'details/', {'exclude': 'content,latest_comments'})
+        caches[settings.BLOG_CACHE_ALIAS].clear()
+        self.assertQueryBudget(2, 'get', path + 'details/', {'fields': 'id,title'})
+        # An empty excerpt does not fall back to the deferred content.
+        Blog.objects.filter(pk=self.dataset.blog.pk).update(content='')
+        caches[settings.BLOG_CACHE_ALIAS].clear()
+        self.assertQueryBudget(2, 'get', path + 'details/', {'fields': 'id', 'excerpt': 20})
+        self.assertEqual(self.client.get(path + 'details/', {'exclude': 'content,latest_comments'}).data,
+                         {name: value for name, value in full.items() if name not in ('content', 'latest_comments')})
+        self.assertEqual(self.client.get('/api/blogs/list_blogs/', {'fields': 'id,secret'}).status_code, 400)
+
+    def test_sparse_fieldsets_do_not_add_queries(self):
+        self.client.get('/api/auth/me/')
+        comments = f'/api/blogs/{self.dataset.blog.pk}/list_comments/'
+        for budget, path, params in (
+            (3, '/api/blogs/list_blogs/', {'fields': 'id,title'}),
+            (1, '/api/blogs/list_blogs/', {'fields': 'id,title', 'pagination': 'cursor'}),
+            (5, comments, {'fields': 'id,content'}),
+            (3, comments, {'fields': 'id,content', 'pagination': 'cursor'}),
+        ):
+            caches[settings.BLOG_CACHE_ALIAS].clear()
+            self.assertQueryBudget(budget, 'get', path, {'page_size': 10, **params})
+
+    def test_list_author_blogs(self):
+        self.client.get('/api/auth/me/')
+        path = f'/api/blogs/author/{self.dataset.admin.pk}/'
+        self.assertQueryBudget(5, 'get', path)
+        self.assertQueryBudget(1, 'get', path)
+        self.client.post(f'/api/blogs/{self.dataset.blog.pk}/like_blog/')
+        self.assertEqual(self.client.get(path).data['results'][-1]['likes_count'], Blog.objects.get(pk=self.dataset.blog.pk).likes_count)
+        self.client.post('/api/blogs/create_blog/', {'title': 'New', 'content': 'Post'}, format='json')
+        self.assertEqual(self.client.get(path).data['results'][0]['title'], 'New')
+
+    def test_trending(self):
+        self.client.get('/api/auth/me/')
+        self.assertQueryBudget(3, 'get', '/api/blogs/trending/', {'limit': 20})
+
+    def test_search(self):
+        self.assertQueryBudget(5, 'get', '/api/blogs/search/', {'q': 'sqlite', 'page_size': 30})
+
+    def test_get_blog_by_id(self):
+        self.assertQueryBudget(5, 'get', f'/api/blogs/{self.dataset.blog.pk}/get_blog_by_id/')
+
+    def test_get_blog_by_id_cached(self):
+        path = f'/api/blogs/{self.dataset.blog.pk}/get_blog_by_id/'
+        self.client.get(path)
+        self.assertQueryBudget(1, 'get', path)
+
+    def test_conditional_get(self):
+        path = f'/api/blogs/{self.dataset.blog.pk}/details/'
+        etag = self.client.get(path)['ETag']
+        self.assertQueryBudget(0, 'get', path, status=304, HTTP_IF_NONE_MATCH=etag)
+
+    def test_details(self):
+        self.assertQueryBudget(6, 'get', f'/api/blogs/{self.dataset.blog.pk}/details/')
+
+    def test_list_comments(self):
+        self.client.get('/api/auth/me/')
+        small = self.assertQueryBudget(5, 'get', f'/api/blogs/{self.dataset.blog.pk}/list_comments/', {'page_size': 2})
+        caches[settings.BLOG_CACHE_ALIAS].clear()
+        large = self.assertQueryBudget(5, 'get', f'/api/blogs/{self.dataset.blog.pk}/list_comments/', {'page_size': 50})
+        self.assertEqual(small, large)
+
+    def test_writes_invalidate_again_after_commit(self):
+        blog = self.dataset.blogs[-1]
+        path = f'/api/blogs/{blog.pk}/get_blog_by_id/'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/blogs/{blog.pk}/comment_blog/', {'content': 'Racing'}, format='json')
+            # A read before the commit caches the payload again.
+            self.client.get(path)
+            self.assertIsNotNone(cache.get_blog_payload(blog.pk, 'by_id'))
+        self.assertIsNone(cache.get_blog_payload(blog.pk, 'by_id'))
+
+    def test_create_blog(self):
+        self.assertQueryBudget(2, 'post', '/api/blogs/create_blog/', {'title': 'Budget', 'content': 'Body'}, status=201)
+
+    def test_update_blog(self):
+        self.assertQueryBudget(6, 'patch', f'/api/blogs/{self.dataset.blog.pk}/update_blog/', {'title': 'Renamed'})
+
+    def test_delete_blog(self):
+        self.assertQueryBudget(7, 'delete', f'/api/blogs/{self.dataset.spare_blogs[0].pk}/delete_blog/')
+
+    def test_like_and_unlike_blog(self):
+        blog = self.dataset.blogs[-1]
+        self.assertQueryBudget(6, 'post', f'/api/blogs/{blog.pk}/like_blog/')
+        self.assertQueryBudget(6, 'post', f'/api/blogs/{blog.pk}/unlike_blog/')
+
+    def test_like_and_unlike_are_idempotent(self):
+        blog = self.dataset.blogs[-1]
+        likes_count = Blog.objects.get(pk=blog.pk).likes_count
+        like, unlike = f'/api/blogs/{blog.pk}/like_blog/', f'/api/blogs/{blog.pk}/unlike_blog/'
+        for _ in range(2):
+            response = self.client.post(like)
+            self.assertEqual((response.data['liked'], response.data['likes_count']), (True, likes_count + 1))
+        self.assertQueryBudget(5, 'post', like)
+        self.assertEqual(blog.likes.filter(user=self.dataset.admin).count(), 1)
+        for _ in range(2):
+            response = self.client.post(unlike)
+            self.assertEqual((response.data['liked'], response.data['likes_count']), (False, likes_count))
+        self.assertQueryBudget(5, 'post', unlike)
+        self.assertFalse(drifted_blogs().exists())
+        self.assertEqual(self.client.post('/api/blogs/0/like_blog/').status_code, 404)
+
+    def test_comment_blog(self):
+        self.assertQueryBudget(8, 'post', f'/api/blogs/{self.dataset.blog.pk}/comment_blog/', {'content': 'Hi'}, status=201)
+
+    def test_update_comment(self):
+        path = f'/api/blogs/{self.dataset.blog.pk}/update_comment/{self.dataset.comment.pk}/'
+        self.assertQueryBudget(5, 'patch', path, {'content': 'Edited'})
+
+    def test_bulk_like_does_not_scale_with_batch(self):
+        blog_ids = [blog.pk for blog in self.dataset.blogs]
+        self.assertQueryBudget(10, 'post', '/api/blogs/bulk_like/', {'blog_ids': blog_ids})
+        self.assertQueryBudget(9, 'post', '/api/blogs/bulk_unlike/', {'blog_ids': blog_ids})
+
+    def test_bulk_comment_does_not_scale_with_batch(self):
+        comments = [{'blog': blog.pk, 'content': 'Bulk'} for blog in self.dataset.blogs]
+        self.assertQueryBudget(11, 'post', '/api/blogs/bulk_comment/', {'comments': comments})
+
+    def test_async_reads(self):
+        blog = self.dataset.blog
+        self.assertQueryBudget(6, 'get', '/api/async/blogs/list_blogs/')
+        self.assertQueryBudget(3, 'get', f'/api/async/blogs/{blog.pk}/get_blog_by_id/')
+        self.assertQueryBudget(4, 'get', f'/api/async/blogs/{blog.pk}/details/')
+        self.assertQueryBudget(4, 'get', f'/api/async/blogs/{blog.pk}/list_comments/')
@@ -0,0 +1,48 @@
+from ..models import Blog, Comment, Like
+from ..counters import drifted_blogs
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class BulkTests(QueryBudgetTestCase):
+    def test_bulk_likes_report_each_blog(self):
+        visible, hidden = self.dataset.blogs[-2], self.dataset.blogs[-1]
+        Blog.objects.filter(pk=hidden.pk).update(is_visible=False)
+        blog_ids = [visible.pk, hidden.pk, 0]
+        expected = [{'blog': visible.pk, 'status': 'liked'}, {'blog': hidden.pk, 'error': 'Blog not found'},
+                    {'blog': 0, 'error': 'Blog not found'}]
+        for _ in range(2):
+            response = self.client.post('/api/blogs/bulk_like/', {'blog_ids': blog_ids}, format='json')
+            self.assertEqual(response.data['results'], expected)
+        self.assertEqual(Like.objects.filter(user=self.dataset.admin, blog_id__in=blog_ids).count(), 1)
+        self.assertFalse(drifted_blogs().exists())
+
+        response = self.client.post('/api/blogs/bulk_unlike/', {'blog_ids': [visible.pk]}, format='json')
+        self.assertEqual(response.data['results'], [{'blog': visible.pk, 'status': 'unliked'}])
+        self.assertFalse(Like.objects.filter(user=self.dataset.admin, blog=visible).exists())
+        self.assertFalse(drifted_blogs().exists())
+
+    def test_bulk_comments_report_each_item(self):
+        blog = self.dataset.blogs[-1]
+        items = [{'blog': blog.pk, 'content': 'Kept'}, {'blog': blog.pk}, {'blog': 'x', 'content': 'Lost'},
+                 {'blog': 0, 'content': 'Lost'}]
+        results = self.client.post('/api/blogs/bulk_comment/', {'comments': items}, format='json').data['results']
+        self.assertEqual(results[0]['comment']['content'], 'Kept')
+        self.assertEqual([set(result['errors']) for result in results[1:]], [{'content'}, {'blog'}, {'blog'}])
+        self.assertEqual(list(Comment.objects.filter(blog=blog, content__in=['Kept', 'Lost']).values_list('content', flat=True)), ['Kept'])
+        self.assertFalse(drifted_blogs().exists())
+        self.assertEqual(self.client.post('/api/blogs/bulk_comment/', {'comments': []}, format='json').status_code, 400)
+
+    def test_bulk_comment_resolves_parents_at_once(self):
+        roots = {comment.blog_id: comment for comment in Comment.objects.filter(parent__isnull=True).order_by('-id')}
+        items = [{'blog': blog_id, 'content': 'Reply', 'parent': root.pk} for blog_id, root in roots.items()]
+        other = next(iter(roots))
+        items += [
+            {'blog': other, 'content': 'Lost', 'parent': 10 ** 9},
+            {'blog': other, 'content': 'Astray', 'parent': roots[next(pk for pk in roots if pk != other)].pk},
+        ]
+        self.client.get('/api/auth/me/')
+        self.assertQueryBudget(11, 'post', '/api/blogs/bulk_comment/', {'comments': items})
+        results = self.client.post('/api/blogs/bulk_comment/', {'comments': items}, format='json').data['results']
+        self.assertEqual([result['comment']['depth'] for result in results[:-2]], [1] * len(roots))
+        self.assertEqual(results[-2]['errors'], {'parent': [f'Invalid pk "{10 ** 9}" - object does not exist.']})
+        self.assertEqual(results[-1]['errors'], {'parent': ['The parent comment belongs to another blog.']})
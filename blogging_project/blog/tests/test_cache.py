@@ -0,0 +1,57 @@
+import tempfile
+from django.core.cache import caches
+from django.conf import settings
+from django.test import override_settings
+from .. import cache
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class ResponseCacheTests(QueryBudgetTestCase):
+    def read(self, blog):
+        details = self.client.get(f'/api/blogs/{blog.pk}/details/').data
+        by_id = self.client.get(f'/api/blogs/{blog.pk}/get_blog_by_id/').data
+        return details, by_id
+
+    def test_cached_reads_follow_every_write(self):
+        blog = self.dataset.blog
+        path = f'/api/blogs/{blog.pk}/'
+        self.read(blog)
+        self.assertIsNotNone(cache.get_blog_payload(blog.pk, 'details'))
+
+        self.client.patch(path + 'update_blog/', {'title': 'Renamed'}, format='json')
+        details, by_id = self.read(blog)
+        self.assertEqual((details['title'], by_id['title']), ('Renamed', 'Renamed'))
+
+        likes_count = by_id['likes_count']
+        self.client.post(path + 'unlike_blog/' if by_id['liked_by_me'] else path + 'like_blog/')
+        self.assertNotEqual(self.read(blog)[1]['likes_count'], likes_count)
+
+        comment = self.client.post(path + 'comment_blog/', {'content': 'Cached?'}, format='json').data
+        details, by_id = self.read(blog)
+        self.assertEqual(details['latest_comments'][0]['content'], 'Cached?')
+        self.assertEqual(by_id['comments_count'], details['comments_count'])
+
+        self.client.patch(path + f'update_comment/{comment["id"]}/', {'content': 'Edited'}, format='json')
+        self.assertEqual(self.read(blog)[0]['latest_comments'][0]['content'], 'Edited')
+
+    def test_list_pages_are_dropped_by_the_generation(self):
+        self.client.get('/api/blogs/list_blogs/')
+        created = self.client.post('/api/blogs/create_blog/', {'title': 'Fresh', 'content': 'Post'}, format='json').data
+        self.assertEqual(self.client.get('/api/blogs/list_blogs/').data['results'][0]['id'], created['id'])
+        self.client.delete(f'/api/blogs/{created["id"]}/delete_blog/')
+        self.assertNotEqual(self.client.get('/api/blogs/list_blogs/').data['results'][0]['id'], created['id'])
+
+    def test_hits_and_misses_are_counted(self):
+        path = f'/api/blogs/{self.dataset.blog.pk}/details/'
+        before = cache.stats().get('details', {'hits': 0, 'misses': 0})
+        self.client.get(path)
+        self.client.get(path)
+        after = self.client.get('/api/blogs/stats/').data['cache']['details']
+        self.assertEqual((after['hits'] - before['hits'], after['misses'] - before['misses']), (1, 1))
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            backend = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory}
+            with override_settings(CACHES={**settings.CACHES, settings.BLOG_CACHE_ALIAS: backend}):
+                caches[settings.BLOG_CACHE_ALIAS].clear()
+                self.test_cached_reads_follow_every_write()
@@ -0,0 +1,10 @@
+from unittest import mock
+from django.test import SimpleTestCase
+from .. import checks
+
+
+class SystemCheckTests(SimpleTestCase):
+    def test_old_sqlite_is_reported(self):
+        self.assertEqual(checks.check_sqlite_version(None), [])
+        with mock.patch('sqlite3.sqlite_version_info', (3, 31, 1)):
+            self.assertEqual([error.id for error in checks.check_sqlite_version(None)], ['blog.E001'])
@@ -0,0 +1,34 @@
+import io
+from django.core.management import call_command
+from django.db.models import F
+from user_auth.models import User
+from ..models import Blog, Comment, Like
+from ..counters import drifted_blogs
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class CounterTests(QueryBudgetTestCase):
+    def test_writes_and_cascades_keep_counters_exact(self):
+        blog = self.dataset.blogs[-1]
+        self.client.post(f'/api/blogs/{blog.pk}/like_blog/')
+        self.client.post(f'/api/blogs/{blog.pk}/comment_blog/', {'content': 'Counted'}, format='json')
+        blog.refresh_from_db()
+        self.assertEqual((blog.likes_count, blog.comments_count), (blog.likes.count(), blog.comments.count()))
+
+        Comment.objects.filter(blog=blog).first().delete()
+        Like.objects.filter(blog=blog).first().delete()
+        # The user's likes and comments on other blogs go with the user.
+        User.objects.get(pk=self.dataset.users[1].pk).delete()
+        self.assertFalse(drifted_blogs().exists())
+
+    def test_reconcile_fixes_drifted_counters(self):
+        drifted = [blog.pk for blog in self.dataset.blogs[:3]]
+        Blog.objects.filter(pk__in=drifted).update(likes_count=F('likes_count') + 3, comments_count=0)
+        self.assertEqual(set(drifted_blogs().values_list('id', flat=True)), set(drifted))
+
+        call_command('reconcile_blogs', dry_run=True, stdout=io.StringIO())
+        self.assertEqual(drifted_blogs().count(), 3)
+        output = io.StringIO()
+        call_command('reconcile_blogs', batch_size=2, stdout=output)
+        self.assertIn('Reconciled 3 blog(s)', output.getvalue())
+        self.assertFalse(drifted_blogs().exists())
@@ -0,0 +1,34 @@
+from django.core.cache import caches
+from django.conf import settings
+from django.db import connection, connections
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from user_auth.authentication import user_cache
+from ..perf import seed_dataset
+
+
+class ReadReplicaRoutingTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        caches[settings.BLOG_CACHE_ALIAS].clear()
+        user_cache.clear()
+        self.dataset = seed_dataset(users=3, blogs=3, likes=1, comments=1)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.dataset.admin).access_token}')
+
+    def test_reads_use_replica_and_writes_use_primary(self):
+        blog = self.dataset.blog
+        for path in ('/api/blogs/list_blogs/', f'/api/blogs/{blog.pk}/details/', f'/api/async/blogs/{blog.pk}/details/'):
+            caches[settings.BLOG_CACHE_ALIAS].clear()
+            with CaptureQueriesContext(connection) as primary, CaptureQueriesContext(connections['replica']) as replica:
+                self.assertEqual(self.client.get(path).status_code, 200)
+            self.assertEqual(len(primary), 0, path)
+            self.assertGreater(len(replica), 0, path)
+
+        with CaptureQueriesContext(connections['replica']) as replica:
+            self.assertEqual(self.client.post(f'/api/blogs/{blog.pk}/comment_blog/', {'content': 'Hi'}, format='json').status_code, 201)
+        self.assertEqual(len(replica), 0)
+        self.assertEqual(self.client.get(f'/api/blogs/{blog.pk}/details/').data['comments_count'], blog.comments.count())
@@ -0,0 +1,75 @@
+import asyncio
+from django.test import override_settings
+from ..models import Like
+from .. import events
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class EventStreamTests(QueryBudgetTestCase):
+    def test_writes_publish_after_commit(self):
+        blog = self.dataset.blogs[-1]
+        before = events.hub.stats()['published']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/blogs/{blog.pk}/like_blog/')
+            self.client.post(f'/api/blogs/{blog.pk}/comment_blog/', {'content': 'Live'}, format='json')
+            self.client.post(f'/api/blogs/{blog.pk}/unlike_blog/')
+        self.assertEqual(events.hub.stats()['published'], before + 3)
+
+    def test_bulk_writes_publish_what_changed(self):
+        blog_ids = [blog.pk for blog in self.dataset.blogs[-3:]]
+        before = events.hub.stats()['published']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/blogs/bulk_like/', {'blog_ids': blog_ids}, format='json')
+            self.client.post('/api/blogs/bulk_like/', {'blog_ids': blog_ids}, format='json')
+            self.client.post('/api/blogs/bulk_unlike/', {'blog_ids': blog_ids[:2]}, format='json')
+            self.client.post('/api/blogs/bulk_comment/', {'comments': [{'blog': blog_ids[0], 'content': 'Live'}]}, format='json')
+        self.assertEqual(events.hub.stats()['published'], before + 6)
+        self.assertEqual(Like.objects.filter(user=self.dataset.admin, blog_id__in=blog_ids).count(), 1)
+
+    async def test_stream_resumes_from_last_event_id(self):
+        blog = self.dataset.blogs[-2]
+        response = await self.async_client.get(f'/api/async/blogs/{blog.pk}/events/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = response.streaming_content
+        self.assertTrue((await anext(chunks)).startswith(b'retry:'))
+        events.hub.publish(blog.pk, 'comment', {'content': 'First'})
+        first = (await anext(chunks)).decode()
+        self.assertIn('event: comment', first)
+        last_id = int(first.split('\n')[0].removeprefix('id: '))
+        await chunks.aclose()
+
+        events.hub.publish(blog.pk, 'like', {'user': 1})
+        resumed = await self.async_client.get(f'/api/async/blogs/{blog.pk}/events/', headers={'Last-Event-ID': str(last_id)})
+        chunks = resumed.streaming_content
+        await anext(chunks)
+        self.assertIn(f'id: {last_id + 1}\nevent: like', (await anext(chunks)).decode())
+        await chunks.aclose()
+
+    @override_settings(SSE_HISTORY=2, SSE_HISTORY_BLOGS=2)
+    async def test_reset_only_when_events_were_lost(self):
+        hub = events.EventHub()
+        for blog_id in (1, 2, 1, 1):
+            hub.publish(blog_id, 'like', {})
+        # Blog 1 keeps events 3 and 4; event 2 was another blog's.
+        self.assertFalse(hub.subscribe(1, last_event_id=1).reset)
+        hub.publish(1, 'like', {})
+        self.assertTrue(hub.subscribe(1, last_event_id=1).reset)
+        self.assertFalse(hub.subscribe(1, last_event_id=3).reset)
+        # Blog 2's history is evicted along with its event 2.
+        hub.publish(3, 'like', {})
+        self.assertTrue(hub.subscribe(2, last_event_id=1).reset)
+        self.assertFalse(hub.subscribe(2, last_event_id=2).reset)
+        self.assertFalse(hub.subscribe(4, last_event_id=6).reset)
+        self.assertTrue(hub.subscribe(4, last_event_id=7).reset)
+
+    @override_settings(SSE_QUEUE_SIZE=2)
+    async def test_slow_readers_are_dropped(self):
+        blog = self.dataset.blogs[-2]
+        chunks = (await self.async_client.get(f'/api/async/blogs/{blog.pk}/events/')).streaming_content
+        await anext(chunks)
+        for n in range(4):
+            events.hub.publish(blog.pk, 'comment', {'content': n})
+        await asyncio.sleep(0)
+        self.assertEqual((await anext(chunks)).decode().count('event: comment'), 2)
+        with self.assertRaises(StopAsyncIteration):
+            await anext(chunks)
@@ -0,0 +1,35 @@
+import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..models import Blog
+from .. import export
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class ExportTests(QueryBudgetTestCase):
+    def test_export_streams_every_blog_in_chunks(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/api/blogs/export/')
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([record['id'] for record in records], list(Blog.objects.order_by('id').values_list('id', flat=True)))
+        for record in records:
+            self.assertEqual(len(record['comments']), record['comments_count'])
+        # Auth, then one blog query and one comment prefetch per chunk.
+        self.assertLessEqual(len(captured), 3)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.dataset.users[1]).access_token}')
+        self.assertEqual(self.client.get('/api/blogs/export/').status_code, 403)
+
+
+    async def test_export_streams_chunks_under_asgi(self):
+        token = RefreshToken.for_user(self.dataset.admin).access_token
+        response = await self.async_client.get('/api/blogs/export/', headers={'Authorization': f'Bearer {token}'})
+        self.assertTrue(response.is_async)
+        lines = b''.join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+        self.assertEqual(len(lines), await Blog.objects.acount())
+        chunks = [chunk async for chunk in export.aiter_ndjson(chunk_size=4)]
+        self.assertEqual(len(chunks), -(-len(lines) // 4))
+        self.assertEqual(''.join(chunks).splitlines(), lines)
@@ -0,0 +1,48 @@
+import io
+import json
+import os
+import tempfile
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase
+from user_auth.models import User
+from ..models import Blog, TrendingScore
+from .. import likes, search
+
+
+class ImportTests(TestCase):
+    def test_import_content(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {kind: os.path.join(directory, name) for kind, name in (
+                ('users', 'users.csv'), ('blogs', 'blogs.ndjson'), ('likes', 'likes.csv'), ('comments', 'comments.ndjson'),
+            )}
+            with open(paths['users'], 'w') as users:
+                users.write('id,username,email,password_hash\n')
+                users.write(f"u1,alice,alice@example.com,{make_password('alice-pw')}\n")
+                users.write(f"u2,bob,bob@example.com,{make_password('bob-pw')}\n")
+                users.write(f"u3,carol,alice@example.com,{make_password('carol-pw')}\n")
+            with open(paths['blogs'], 'w') as blogs:
+                blogs.write(json.dumps({'id': 10, 'author': 'u1', 'title': 'Imported zebra', 'content': 'Body',
+                                        'created_at': '2020-01-02T03:04:05Z'}) + '\n')
+                blogs.write(json.dumps({'id': 11, 'author': 'nobody', 'title': 'Orphan', 'content': 'Body'}) + '\n')
+            with open(paths['likes'], 'w') as likes:
+                likes.write('user,blog\nu1,10\nu2,10\nu2,10\n')
+            with open(paths['comments'], 'w') as comments:
+                comments.write(json.dumps({'id': 'c1', 'user': 'u2', 'blog': 10, 'content': 'Nice'}) + '\n')
+                comments.write(json.dumps({'id': 'c2', 'parent': 'c1', 'user': 'u1', 'blog': 10, 'content': 'Thanks'}) + '\n')
+            output, errors = io.StringIO(), io.StringIO()
+            call_command('import_content', pre_hashed=True, hash_workers=0, batch_size=2, stdout=output, stderr=errors,
+                         **paths)
+
+        self.assertRegex(output.getvalue(), r'users\s+2 loaded\s+1 skipped')
+        self.assertIn("users u3: email 'alice@example.com' belongs to another user", errors.getvalue())
+        self.assertRegex(output.getvalue(), r'blogs\s+1 loaded\s+1 skipped')
+        blog = Blog.objects.get(title='Imported zebra')
+        self.assertEqual(blog.author.username, 'alice')
+        self.assertEqual(blog.created_at.year, 2020)
+        self.assertEqual((blog.likes_count, blog.comments_count), (2, 2))
+        reply = blog.comments.get(content='Thanks')
+        self.assertEqual(reply.path, reply.parent.path + f'{reply.pk:010d}')
+        self.assertTrue(User.objects.get(username='bob').check_password('bob-pw'))
+        self.assertTrue(TrendingScore.objects.filter(blog=blog).exists())
+        self.assertEqual(list(search.search_blogs(Blog.objects.all(), 'zebra')), [blog])
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..models import Like
+from .. import likes
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class LikedByMeTests(QueryBudgetTestCase):
+    def as_user(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+    def test_liked_by_me_is_per_viewer_on_cached_payloads(self):
+        # The newest blog, first on the list page.
+        blog = self.dataset.spare_blogs[0]
+        liker, other = self.dataset.users[1:3]
+        self.as_user(liker)
+        self.client.post(f'/api/blogs/{blog.pk}/like_blog/')
+        row = self.client.get('/api/blogs/list_blogs/').data['results'][0]
+        self.assertEqual((row['id'], row['liked_by_me'], row['recent_likers'][0]), (blog.pk, True, liker.pk))
+        path = f'/api/blogs/{blog.pk}/get_blog_by_id/'
+        mine = self.client.get(path)
+        self.assertTrue(mine.data['liked_by_me'])
+        self.assertIn('Authorization', mine['Vary'])
+
+        self.as_user(other)
+        self.assertFalse(self.client.get('/api/blogs/list_blogs/').data['results'][0]['liked_by_me'])
+        theirs = self.client.get(path, HTTP_IF_NONE_MATCH=mine['ETag'])
+        self.assertEqual(theirs.status_code, 200)
+        self.assertFalse(theirs.data['liked_by_me'])
+        self.assertFalse(self.client.get(f'/api/blogs/{blog.pk}/details/').data['liked_by_me'])
+        self.assertEqual(set(self.client.get('/api/blogs/list_blogs/', {'fields': 'liked_by_me'}).data['results'][0]),
+                         {'id', 'liked_by_me'})
+
+    async def test_async_reads_use_the_bearer_token(self):
+        blog, liker = self.dataset.spare_blogs[0], self.dataset.users[1]
+        await Like.objects.acreate(user=liker, blog=blog)
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(liker).access_token}'}
+        for path in ('get_blog_by_id', 'details'):
+            response = await self.async_client.get(f'/api/async/blogs/{blog.pk}/{path}/', headers=headers)
+            self.assertTrue(response.json()['liked_by_me'])
+        response = await self.async_client.get('/api/async/blogs/list_blogs/', headers=headers)
+        self.assertTrue(response.json()['results'][0]['liked_by_me'])
+        response = await self.async_client.get(f'/api/async/blogs/{blog.pk}/get_blog_by_id/')
+        self.assertFalse(response.json()['liked_by_me'])
+
+    def test_recent_likers_are_the_latest_of_each_blog(self):
+        blog_ids = [blog.pk for blog in self.dataset.blogs]
+        with CaptureQueriesContext(connection) as captured:
+            recent = likes.recent_likers(blog_ids, limit=2)
+        self.assertEqual(len(captured), 1)
+        for blog in self.dataset.blogs:
+            expected = list(blog.likes.order_by('-created_at', '-id').values_list('user_id', flat=True)[:2])
+            self.assertEqual(recent[blog.pk], expected)
@@ -0,0 +1,42 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ..models import Blog, Comment
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class CursorPaginationTests(QueryBudgetTestCase):
+    def walk(self, path, params):
+        rows, queries, cursor = [], [], None
+        while True:
+            with CaptureQueriesContext(connection) as captured:
+                page = self.client.get(path, {**params, 'pagination': 'cursor', **({'cursor': cursor} if cursor else {})}).data
+            queries += [query['sql'] for query in captured]
+            rows += page['results']
+            if not page['next']:
+                return rows, queries
+            cursor = page['next'].split('cursor=')[1].split('&')[0]
+
+    def assertUsesIndex(self, sql, index):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn(index, plan, sql)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_blog_pages_follow_created_at_then_id(self):
+        # Ties on created_at are broken by id, so no row is skipped or repeated at a page boundary.
+        Blog.objects.filter(pk__in=[blog.pk for blog in self.dataset.blogs[:10]]).update(created_at=timezone.now())
+        rows, queries = self.walk('/api/blogs/list_blogs/', {'page_size': 4})
+        expected = list(Blog.objects.filter(is_visible=True).order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual([row['id'] for row in rows], expected)
+        self.assertFalse([sql for sql in queries if 'COUNT(' in sql])
+        self.assertUsesIndex([sql for sql in queries if 'FROM "blog_blog"' in sql][-1], 'blog_visible_created_idx')
+
+    def test_comment_pages_follow_created_at_then_id(self):
+        blog = self.dataset.blog
+        rows, queries = self.walk(f'/api/blogs/{blog.pk}/list_comments/', {'page_size': 3})
+        expected = list(blog.comments.filter(is_visible=True).order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual([row['id'] for row in rows], expected)
+        self.assertFalse([sql for sql in queries if 'COUNT(' in sql])
+        self.assertUsesIndex([sql for sql in queries if 'FROM "blog_comment"' in sql][-1], 'comment_visible_created_idx')
@@ -0,0 +1,42 @@
+import io
+from django.core.management import call_command
+from django.db import connection
+from ..models import Blog
+from .. import search
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class SearchTests(QueryBudgetTestCase):
+    def search(self, query):
+        return [row['id'] for row in self.client.get('/api/blogs/search/', {'q': query}).data['results']]
+
+    def create(self, title, content):
+        return self.client.post('/api/blogs/create_blog/', {'title': title, 'content': content}, format='json').data['id']
+
+    def test_index_follows_blog_writes(self):
+        pk = self.create('Quokka sightings', 'Body')
+        self.assertEqual(self.search('quokka'), [pk])
+        self.client.patch(f'/api/blogs/{pk}/update_blog/', {'title': 'Wombat sightings'}, format='json')
+        self.assertEqual((self.search('quokka'), self.search('wombat')), ([], [pk]))
+        self.client.delete(f'/api/blogs/{pk}/delete_blog/')
+        self.assertEqual(self.search('wombat'), [])
+
+    def test_results_are_ranked_and_visible_only(self):
+        once = self.create('Numbat', 'A note.')
+        often = self.create('Numbat notes', 'Numbat, numbat and more numbat.')
+        hidden = self.create('Numbat archive', 'Numbat numbat numbat numbat.')
+        Blog.objects.filter(pk=hidden).update(is_visible=False)
+        self.assertEqual(self.search('numbat'), [often, once])
+
+    def test_rebuild_restores_the_index(self):
+        pk = self.create('Echidna', 'Body')
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {search.FTS_TABLE}({search.FTS_TABLE}) VALUES ('delete-all')")
+        self.assertEqual(self.search('echidna'), [])
+        call_command('rebuild_search_index', optimize=True, stdout=io.StringIO())
+        self.assertEqual(self.search('echidna'), [pk])
+
+    def test_search_snippets_escape_blog_content(self):
+        self.client.post('/api/blogs/create_blog/', {'title': 'Markup', 'content': 'zebra <script>alert(1)</script>'}, format='json')
+        result = self.client.get('/api/blogs/search/', {'q': 'zebra'}).data['results'][0]
+        self.assertEqual(result['snippet'], '<mark>zebra</mark> &lt;script&gt;alert(1)&lt;/script&gt;')
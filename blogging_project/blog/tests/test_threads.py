@@ -0,0 +1,48 @@
+from ..models import Blog, Comment
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class CommentThreadTests(QueryBudgetTestCase):
+    def reply(self, parent, content):
+        response = self.client.post(f'/api/blogs/{parent.blog_id}/comment_blog/', {'content': content, 'parent': parent.pk}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return Comment.objects.get(pk=response.data['id'])
+
+    def test_threads_are_read_as_index_ranges(self):
+        response = self.client.post(f'/api/blogs/{self.dataset.blog.pk}/comment_blog/', {'content': 'Root'}, format='json')
+        root = Comment.objects.get(pk=response.data['id'])
+        first = self.reply(root, 'First reply')
+        nested = self.reply(first, 'Nested reply')
+        deeper = self.reply(nested, 'Deeper reply')
+        second = self.reply(root, 'Second reply')
+        self.assertEqual(deeper.path, root.path + ''.join(f'{pk:010d}' for pk in (first.pk, nested.pk, deeper.pk)))
+        path = f'/api/blogs/{root.blog_id}/list_comments/'
+
+        # The subtree comes out depth first whatever its depth, as one range query plus the count.
+        self.assertQueryBudget(6, 'get', path, {'thread': first.pk})
+        results = self.client.get(path, {'thread': root.pk}).data['results']
+        self.assertEqual([(row['id'], row['depth']) for row in results],
+                         [(root.pk, 0), (first.pk, 1), (nested.pk, 2), (deeper.pk, 3), (second.pk, 1)])
+        cursor = self.client.get(path, {'thread': root.pk, 'pagination': 'cursor', 'page_size': 2}).data
+        self.assertEqual([row['id'] for row in cursor['results']], [root.pk, first.pk])
+
+        self.assertQueryBudget(6, 'get', path, {'replies': 2})
+        page = self.client.get(path, {'replies': 2}).data['results']
+        self.assertTrue(all(row['parent'] is None for row in page))
+        thread = next(row for row in page if row['id'] == root.pk)
+        self.assertEqual([reply['id'] for reply in thread['replies']], [first.pk, nested.pk])
+        self.assertEqual(thread['replies_count'], 4)
+
+        details = self.client.get(f'/api/blogs/{root.blog_id}/details/', {'replies': 1}).data
+        self.assertTrue(all(row['parent'] is None for row in details['latest_comments']))
+
+        # Deleting a comment takes its replies and their counts with it.
+        count = Blog.objects.get(pk=root.blog_id).comments_count
+        first.delete()
+        self.assertEqual(Blog.objects.get(pk=root.blog_id).comments_count, count - 3)
+
+    def test_reply_must_stay_on_its_blog(self):
+        other = self.dataset.blogs[1]
+        response = self.client.post(f'/api/blogs/{other.pk}/comment_blog/', {'content': 'Hi', 'parent': self.dataset.comment.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('parent', response.data)
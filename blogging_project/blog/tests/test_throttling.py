@@ -0,0 +1,42 @@
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from blogging_project import throttling
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class WriteThrottleTests(QueryBudgetTestCase):
+    def like(self, user, blog):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return self.client.post(f'/api/blogs/{blog.pk}/like_blog/')
+
+    @override_settings(WRITE_THROTTLE_USER_RATE='1/min', WRITE_THROTTLE_USER_BURST=2, WRITE_THROTTLE_GLOBAL_RATE=None)
+    def test_per_user_bucket(self):
+        before = throttling.stats().get('write_user', {'admitted': 0, 'rejected': 0})
+        first, second = self.dataset.users[1:3]
+        blogs = self.dataset.blogs[-3:]
+        self.assertEqual([self.like(first, blog).status_code for blog in blogs[:2]], [200, 200])
+        response = self.like(first, blogs[2])
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        # Other users have their own bucket, and reads are never throttled.
+        self.assertEqual(self.like(second, blogs[2]).status_code, 200)
+        self.assertEqual(self.client.get('/api/blogs/list_blogs/').status_code, 200)
+        after = throttling.stats()['write_user']
+        self.assertEqual(after['admitted'] - before['admitted'], 3)
+        self.assertEqual(after['rejected'] - before['rejected'], 1)
+
+    @override_settings(WRITE_THROTTLE_USER_RATE=None, WRITE_THROTTLE_GLOBAL_RATE='1/s', WRITE_THROTTLE_GLOBAL_BURST=1)
+    def test_global_bucket(self):
+        first, second = self.dataset.users[1:3]
+        blog = self.dataset.blogs[-1]
+        self.assertEqual(self.like(first, blog).status_code, 200)
+        self.assertEqual(self.like(second, blog).status_code, 429)
+
+
+    @override_settings(WRITE_THROTTLE_USER_RATE='1/min', WRITE_THROTTLE_USER_BURST=1,
+                       WRITE_THROTTLE_GLOBAL_RATE='1/min', WRITE_THROTTLE_GLOBAL_BURST=4)
+    def test_throttled_user_does_not_drain_global_bucket(self):
+        first, second = self.dataset.users[1:3]
+        blogs = self.dataset.blogs[-5:]
+        self.assertEqual([self.like(first, blog).status_code for blog in blogs], [200, 429, 429, 429, 429])
+        self.assertEqual(self.like(second, blogs[0]).status_code, 200)
@@ -0,0 +1,55 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from ..models import Blog, Like, TrendingScore
+from .. import trending
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class TrendingTests(QueryBudgetTestCase):
+    def test_activity_moves_blog_up_and_decays(self):
+        blog = self.dataset.blogs[-1]
+        before = TrendingScore.objects.filter(blog=blog).values_list('score', flat=True).first() or 0
+        self.client.post(f'/api/blogs/{blog.pk}/comment_blog/', {'content': 'Hot'}, format='json')
+        self.client.post(f'/api/blogs/{blog.pk}/like_blog/')
+        score = TrendingScore.objects.get(blog=blog).score
+        self.assertAlmostEqual(score, before + settings.TRENDING_COMMENT_WEIGHT + settings.TRENDING_LIKE_WEIGHT)
+
+        self.client.post(f'/api/blogs/{blog.pk}/unlike_blog/')
+        self.assertAlmostEqual(TrendingScore.objects.get(blog=blog).score, before + settings.TRENDING_COMMENT_WEIGHT, places=3)
+
+        TrendingScore.objects.update(score=F('score') * 1000)
+        top = self.client.get('/api/blogs/trending/', {'limit': 3}).data['results']
+        self.assertEqual(len(top), 3)
+        self.assertEqual([row['score'] for row in top], sorted((row['score'] for row in top), reverse=True))
+
+        now = timezone.now() + timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS)
+        scores = dict(TrendingScore.objects.values_list('blog_id', 'score'))
+        trending.decay(now=now)
+        for blog_id, decayed in TrendingScore.objects.values_list('blog_id', 'score'):
+            self.assertAlmostEqual(decayed, scores[blog_id] / 2, delta=scores[blog_id] * 1e-3)
+
+    def test_unlike_retracts_what_the_like_added(self):
+        blog = self.dataset.blogs[-1]
+        TrendingScore.objects.filter(blog=blog).delete()
+        self.client.post(f'/api/blogs/{blog.pk}/like_blog/')
+        day_ago = timezone.now() - timedelta(hours=24)
+        Like.objects.filter(blog=blog).update(created_at=day_ago)
+        TrendingScore.objects.filter(blog=blog).update(decayed_at=day_ago)
+        self.client.post(f'/api/blogs/{blog.pk}/unlike_blog/')
+        self.assertAlmostEqual(TrendingScore.objects.get(blog=blog).score, 0)
+
+        # Activity from before the last decay run is taken back decayed to that run.
+        TrendingScore.objects.filter(blog=blog).update(score=0.5, decayed_at=day_ago + timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS))
+        trending.retract(blog.pk, 1.0, day_ago)
+        self.assertAlmostEqual(TrendingScore.objects.get(blog=blog).score, 0)
+
+    def test_rebuild_matches_recent_activity(self):
+        TrendingScore.objects.all().delete()
+        trending.rebuild()
+        blog = self.dataset.blog
+        expected = blog.likes.count() * settings.TRENDING_LIKE_WEIGHT + blog.comments.count() * settings.TRENDING_COMMENT_WEIGHT
+        self.assertAlmostEqual(TrendingScore.objects.get(blog=blog).score, expected, delta=expected * 0.05)
+        self.assertEqual(TrendingScore.objects.count(), Blog.objects.filter(likes__isnull=False).union(
+            Blog.objects.filter(comments__isnull=False)).count())
@@ -0,0 +1,26 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from ..models import Blog
+from ..viewcounts import view_counter
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class ViewCountTests(QueryBudgetTestCase):
+    @override_settings(VIEW_COUNT_ENABLED=True)
+    def test_views_are_buffered_and_flushed_in_one_statement(self):
+        view_counter.flush()
+        blog, other = self.dataset.blogs[:2]
+        with CaptureQueriesContext(connection) as captured:
+            for path in ('get_blog_by_id', 'get_blog_by_id', 'details'):
+                self.assertEqual(self.client.get(f'/api/blogs/{blog.pk}/{path}/').status_code, 200)
+            self.client.get(f'/api/async/blogs/{other.pk}/details/')
+            self.client.get('/api/blogs/999999/details/')
+        self.assertFalse([query for query in captured if query['sql'].startswith('UPDATE')])
+        self.assertEqual(view_counter.pending(), 4)
+
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(view_counter.flush(), 4)
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(Blog.objects.get(pk=blog.pk).views_count, 3)
+        self.assertEqual(Blog.objects.get(pk=other.pk).views_count, 1)
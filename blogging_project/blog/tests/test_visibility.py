@@ -0,0 +1,66 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from user_auth.models import User
+from ..models import Blog, Comment
+from .. import threads
+from blogging_project.testing import QueryBudgetTestCase
+
+
+class VisibilityTests(QueryBudgetTestCase):
+    def test_visibility_changes_update_validators(self):
+        user = self.dataset.users[1]
+        blog_id = Comment.objects.filter(user=user).exclude(blog__author=user).values_list('blog_id', flat=True).first()
+        path = f'/api/blogs/{blog_id}/list_comments/'
+        etag = self.client.get(path, {'page_size': 50})['ETag']
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.client.get(path, {'page_size': 50}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_saving_a_loaded_user_does_not_reread_is_active(self):
+        user = User.objects.get(pk=self.dataset.users[1].pk)
+        user.first_name = 'Renamed'
+        with self.assertNumQueries(1):
+            user.save()
+        user.is_active = False
+        user.save()
+        self.assertFalse(Blog.objects.filter(author=user, is_visible=True).exists())
+
+    @override_settings(VISIBILITY_CHUNK_SIZE=2)
+    def test_deactivated_users_are_hidden_without_joins(self):
+        user = self.dataset.users[1]
+        blog_ids = set(user.blogs.values_list('id', flat=True))
+        commented = set(Comment.objects.filter(user=user).values_list('blog_id', flat=True))
+        self.assertTrue(blog_ids and commented)
+
+        user.is_active = False
+        user.save()
+        self.assertFalse(Blog.objects.filter(pk__in=blog_ids, is_visible=True).exists())
+        self.assertFalse(Comment.objects.filter(user=user, is_visible=True).exists())
+        listed = {row['id'] for row in self.client.get('/api/blogs/list_blogs/', {'page_size': 50}).data['results']}
+        self.assertFalse(listed & blog_ids)
+        self.assertEqual(self.client.get(f'/api/blogs/{min(blog_ids)}/details/').status_code, 404)
+        for blog_id in commented - blog_ids:
+            comments = self.client.get(f'/api/blogs/{blog_id}/list_comments/', {'page_size': 50}).data
+            self.assertNotIn(user.pk, {row['user'] for row in comments['results']} if comments else set())
+
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get('/api/blogs/list_blogs/', {'page': 2})
+        self.assertFalse([query for query in captured if 'user_auth_user' in query['sql'] and 'blog_blog' in query['sql']])
+
+        user.is_active = True
+        user.save()
+        self.assertEqual(set(Blog.objects.filter(is_visible=True, author=user).values_list('id', flat=True)), blog_ids)
+        self.assertFalse(Comment.objects.filter(user=user, is_visible=False).exists())
+
+    def test_visible_reads_are_ordered_by_their_indexes(self):
+        blog = self.dataset.blog
+        comments = Comment.objects.filter(blog=blog, is_visible=True)
+        for queryset, index in (
+            (Blog.objects.filter(is_visible=True).order_by('-created_at', '-id'), 'blog_visible_created_idx'),
+            (comments.order_by('-created_at', '-id'), 'comment_visible_created_idx'),
+            (comments.filter(threads.subtree(self.dataset.comment.path)).order_by('path'), 'comment_visible_path_idx'),
+        ):
+            plan = queryset[:5].explain()
+            self.assertIn(index, plan)
+            self.assertNotIn('TEMP B-TREE', plan)
@@ -0,0 +1,88 @@
+"""Materialized paths for threaded comments.
+
+A comment's ``path`` is the ids of its ancestors followed by its own id, each
+written as a fixed-width decimal segment. Ordering by path therefore lists a
+thread depth first with siblings oldest first, and the replies below a
+comment are the contiguous range of paths that extend its own. With the
+(blog, path) index any subtree is one ordered range scan, however deep.
+"""
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber, Substr
+from .models import Comment
+
+SEGMENT = 10
+# Sorts right after '9', so ``path < prefix + END`` bounds everything under ``prefix``.
+END = ':'
+
+
+def segment(pk):
+    return f'{pk:0{SEGMENT}d}'
+
+
+def depth(path):
+    """0 for top-level comments, 1 for their replies and so on."""
+    return max(len(path) // SEGMENT - 1, 0)
+
+
+def subtree(path):
+    """Lookups matching the comment with ``path`` and everything below it."""
+    return Q(path__gte=path, path__lt=path + END)
+
+
+def descendants(paths):
+    """Lookups matching the replies below any of ``paths``, as one OR of index ranges."""
+    condition = Q(pk__in=[])
+    for path in paths:
+        condition |= Q(path__gt=path, path__lt=path + END)
+    return condition
+
+
+def assign_paths(comments, batch_size=None):
+    """Fill in the path of freshly inserted ``comments`` with a single UPDATE.
+
+    Parents are looked up among ``comments`` themselves first (they have to
+    come before their replies), then in one query for the rest.
+    """
+    paths = {}
+    missing = {
+        comment.parent_id for comment in comments
+        if comment.parent_id is not None and not Comment.parent.is_cached(comment)
+    } - {comment.pk for comment in comments}
+    if missing:
+        paths.update(Comment.objects.filter(pk__in=missing).values_list('pk', 'path'))
+    for comment in comments:
+        if comment.parent_id is None:
+            prefix = ''
+        elif comment.parent_id in paths:
+            prefix = paths[comment.parent_id]
+        else:
+            prefix = comment.parent.path
+        comment.path = paths[comment.pk] = prefix + segment(comment.pk)
+    if len(comments) == 1:
+        Comment.objects.filter(pk=comments[0].pk).update(path=comments[0].path)
+    elif comments:
+        Comment.objects.bulk_update(comments, ['path'], batch_size=batch_size)
+
+
+def attach_replies(roots, queryset, limit):
+    """Load the first ``limit`` replies of each top-level comment in ``roots`` in one query.
+
+    Every root gets ``thread_replies``, its replies in thread order, and
+    ``replies_count``, the size of its whole thread. ``queryset`` is the
+    visible comments of the blog.
+    """
+    for root in roots:
+        root.thread_replies, root.replies_count = [], 0
+    if not roots:
+        return roots
+    by_path = {root.path: root for root in roots}
+    thread = Substr('path', 1, SEGMENT)
+    replies = queryset.filter(descendants(by_path)).annotate(
+        position=Window(RowNumber(), partition_by=thread, order_by=F('path').asc()),
+        thread_size=Window(Count('pk'), partition_by=thread),
+    ).filter(position__lte=limit).order_by('path')
+    for reply in replies:
+        root = by_path[reply.path[:SEGMENT]]
+        root.thread_replies.append(reply)
+        root.replies_count = reply.thread_size
+    return roots
@@ -0,0 +1,113 @@
+"""Incrementally maintained "hot" ranking of blogs.
+
+Every like adds TRENDING_LIKE_WEIGHT and every comment TRENDING_COMMENT_WEIGHT
+to the blog's TrendingScore row. Scores halve every TRENDING_HALF_LIFE_HOURS,
+applied in batches by ``decay()`` (the ``decay_trending`` command), so
+between two runs recent activity counts at full weight. ``rebuild()``
+recomputes scores from the Like and Comment rows of the last
+TRENDING_WINDOW_HOURS.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, DurationField, ExpressionWrapper, F, FloatField, Value, When
+from django.db.models.functions import Cast, Greatest, Power, TruncHour
+from django.utils import timezone
+from .models import Like, Comment, TrendingScore
+
+
+def decay_factor(elapsed):
+    return 0.5 ** (elapsed.total_seconds() / 3600 / settings.TRENDING_HALF_LIFE_HOURS)
+
+
+def bump(blog_id, weight):
+    """Add ``weight`` (negative to retract activity) to the blog's score."""
+    scores = TrendingScore.objects.filter(blog_id=blog_id)
+    if scores.update(score=Greatest(F('score') + weight, Value(0.0))) or weight <= 0:
+        return
+    try:
+        with transaction.atomic():
+            TrendingScore.objects.create(blog_id=blog_id, score=weight, decayed_at=timezone.now())
+    except IntegrityError:
+        # Created concurrently.
+        scores.update(score=F('score') + weight)
+
+
+def like_added(blog_id):
+    bump(blog_id, settings.TRENDING_LIKE_WEIGHT)
+
+
+def retract(blog_id, weight, created_at):
+    """Take back activity of ``weight`` from ``created_at``, as far as the stored score has decayed it.
+
+    The score is only decayed up to its row's ``decayed_at``, so the
+    activity is worth ``weight`` decayed from ``created_at`` to then, or its
+    full weight when it happened later. One UPDATE, relative to the row.
+    """
+    elapsed = ExpressionWrapper(F('decayed_at') - Value(created_at), output_field=DurationField())
+    half_life = settings.TRENDING_HALF_LIFE_HOURS * 3600 * 10 ** 6
+    worth = Case(
+        When(decayed_at__gt=created_at, then=weight * Power(Value(0.5), Cast(elapsed, FloatField()) / half_life)),
+        default=Value(float(weight)),
+    )
+    TrendingScore.objects.filter(blog_id=blog_id).update(score=Greatest(F('score') - worth, Value(0.0)))
+
+
+def like_removed(like):
+    retract(like.blog_id, settings.TRENDING_LIKE_WEIGHT, like.created_at)
+
+
+def comment_added(blog_id):
+    bump(blog_id, settings.TRENDING_COMMENT_WEIGHT)
+
+
+def comment_removed(comment):
+    retract(comment.blog_id, settings.TRENDING_COMMENT_WEIGHT, comment.created_at)
+
+
+def decay(batch_size=1000, now=None):
+    """Decay every score to ``now`` and drop rows below TRENDING_MIN_SCORE. Returns ``(decayed, dropped)``."""
+    now = now or timezone.now()
+    decayed = 0
+    last_pk = 0
+    while True:
+        rows = list(TrendingScore.objects.filter(pk__gt=last_pk, decayed_at__lt=now).order_by('pk')[:batch_size])
+        if not rows:
+            break
+        for row in rows:
+            row.score *= decay_factor(now - row.decayed_at)
+            row.decayed_at = now
+        TrendingScore.objects.bulk_update(rows, ['score', 'decayed_at'])
+        decayed += len(rows)
+        last_pk = rows[-1].pk
+    dropped, _ = TrendingScore.objects.filter(score__lt=settings.TRENDING_MIN_SCORE).delete()
+    return decayed, dropped
+
+
+def rebuild(blog_ids=None, now=None, batch_size=1000):
+    """Recompute scores from recent likes and comments, for ``blog_ids`` or every blog.
+
+    Activity is bucketed by hour, so only one row per blog and hour is read.
+    """
+    now = now or timezone.now()
+    since = now - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    scores = defaultdict(float)
+    for model, weight in ((Like, settings.TRENDING_LIKE_WEIGHT), (Comment, settings.TRENDING_COMMENT_WEIGHT)):
+        activity = model.objects.filter(created_at__gte=since)
+        if blog_ids is not None:
+            activity = activity.filter(blog_id__in=blog_ids)
+        buckets = activity.annotate(hour=TruncHour('created_at')).order_by().values('blog_id', 'hour').annotate(total=Count('pk'))
+        for bucket in buckets:
+            scores[bucket['blog_id']] += weight * bucket['total'] * decay_factor(now - bucket['hour'])
+
+    with transaction.atomic(savepoint=False):
+        if blog_ids is None:
+            TrendingScore.objects.all().delete()
+        else:
+            TrendingScore.objects.filter(blog_id__in=blog_ids).exclude(blog_id__in=list(scores)).delete()
+        TrendingScore.objects.bulk_create(
+            [TrendingScore(blog_id=blog_id, score=score, decayed_at=now) for blog_id, score in scores.items()],
+            update_conflicts=True, unique_fields=['blog'], update_fields=['score', 'decayed_at'], batch_size=batch_size,
+        )
+    return len(scores)
@@ -0,0 +1,99 @@
+"""Buffered per-blog view counting.
+
+Reads only add to an in-process buffer. Increments are coalesced per blog
+and written by a background thread, VIEW_COUNT_FLUSH_INTERVAL seconds after
+the first pending view or as soon as VIEW_COUNT_FLUSH_SIZE blogs are
+pending, with one ``UPDATE ... CASE`` per batch of blogs, and once more at
+interpreter exit. Counts are approximate: views buffered by a process that
+is killed are lost, and cached payloads show the count they were cached
+with.
+"""
+import atexit
+import logging
+import threading
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import Case, F, Value, When
+from .models import Blog
+
+logger = logging.getLogger(__name__)
+
+# Blogs per UPDATE statement, three parameters each.
+UPDATE_BATCH_SIZE = 500
+
+
+class ViewCounter:
+    def __init__(self, flush_size, flush_interval):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def record(self, pk):
+        """Count one view of blog ``pk``; never touches the database."""
+        if not settings.VIEW_COUNT_ENABLED:
+            return
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self._pending[pk] = self._pending.get(pk, 0) + 1
+            if len(self._pending) >= self.flush_size:
+                self._schedule(0)
+            elif self._timer is None:
+                self._schedule(self.flush_interval)
+
+    def _schedule(self, delay):
+        if self._timer is not None:
+            if delay:
+                return
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._background_flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_flush(self):
+        try:
+            self.flush()
+        finally:
+            # Connections are per thread, do not leave this one open.
+            connections.close_all()
+
+    def flush(self):
+        """Write all pending increments now. Returns the number of views written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        items = sorted(pending.items())
+        written = 0
+        for start in range(0, len(items), UPDATE_BATCH_SIZE):
+            batch = dict(items[start:start + UPDATE_BATCH_SIZE])
+            try:
+                Blog.objects.filter(pk__in=batch).update(views_count=F('views_count') + Case(
+                    *(When(pk=pk, then=Value(count)) for pk, count in batch.items()), default=Value(0),
+                ))
+            except DatabaseError:
+                logger.exception("Could not flush %d blog view count(s), keeping them for the next flush", len(batch))
+                self._requeue(batch)
+            else:
+                written += sum(batch.values())
+        return written
+
+    def _requeue(self, batch):
+        with self._lock:
+            for pk, count in batch.items():
+                self._pending[pk] = self._pending.get(pk, 0) + count
+            if self._timer is None:
+                self._schedule(self.flush_interval)
+
+    def pending(self):
+        with self._lock:
+            return sum(self._pending.values())
+
+
+view_counter = ViewCounter(settings.VIEW_COUNT_FLUSH_SIZE, settings.VIEW_COUNT_FLUSH_INTERVAL)
+atexit.register(view_counter.flush)
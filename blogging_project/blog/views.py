@@ -1,22 +1,34 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from blogging_project.apidocs import openapi, swagger_auto_schema
+from django.conf import settings
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.db.models import F
+from django.db.models.functions import Substr
+from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
-from .models import Blog, Like, Comment
-from .serializers import BlogSerializer, BlogDetailSerializer, CommentSerializer, LikeSerializer
-import os
-from dotenv import load_dotenv
+from blogging_project.dbrouters import replica_reads
+from blogging_project.throttling import write_throttles
+from blogging_project import throttling
+from user_auth.authentication import user_cache
+from user_auth.models import User
+from .models import Blog, Comment
+from .serializers import (
+    BlogSerializer, BlogDetailSerializer, BlogSearchSerializer, TrendingBlogSerializer, CommentSerializer,
+    ThreadedCommentSerializer, BulkBlogIdsSerializer, BulkCommentSerializer, excerpt,
+)
+from . import bulk, cache, conditional, events, export, likes, search, threads
+from .viewcounts import view_counter
 
-load_dotenv()
-
-PAGE_SIZE_BLOGS = int(os.getenv('PAGE_SIZE_BLOGS'))
-MAX_PAGE_SIZE_BLOGS = int(os.getenv('MAX_PAGE_SIZE_BLOGS'))
-PAGE_SIZE_COMMENTS = int(os.getenv('PAGE_SIZE_COMMENTS'))
-MAX_PAGE_SIZE_COMMENTS = int(os.getenv('MAX_PAGE_SIZE_COMMENTS'))
-COMMENTS_ON_DETAIL_BLOG = int(os.getenv('COMMENTS_ON_DETAIL_BLOG'))
+PAGE_SIZE_BLOGS = settings.PAGE_SIZE_BLOGS
+MAX_PAGE_SIZE_BLOGS = settings.MAX_PAGE_SIZE_BLOGS
+PAGE_SIZE_COMMENTS = settings.PAGE_SIZE_COMMENTS
+MAX_PAGE_SIZE_COMMENTS = settings.MAX_PAGE_SIZE_COMMENTS
+COMMENTS_ON_DETAIL_BLOG = settings.COMMENTS_ON_DETAIL_BLOG
 
 
 class BlogPagination(PageNumberPagination):
@@ -31,8 +43,172 @@ class CommentPagination(PageNumberPagination):
     max_page_size = MAX_PAGE_SIZE_COMMENTS
 
 
+class BlogCursorPagination(CursorPagination):
+    page_size = PAGE_SIZE_BLOGS
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE_BLOGS
+    ordering = ('-created_at', '-id')
+
+
+class CommentCursorPagination(CursorPagination):
+    page_size = PAGE_SIZE_COMMENTS
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE_COMMENTS
+    ordering = ('-created_at', '-id')
+
+
+class ThreadCursorPagination(CommentCursorPagination):
+    ordering = ('path',)
+
+
+def uses_cursor_pagination(request):
+    return request.query_params.get('pagination') == 'cursor' or 'cursor' in request.query_params
+
+
+pagination_params = [
+    openapi.Parameter('pagination', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['page', 'cursor'],
+                      description="Use `cursor` for keyset pagination on (created_at, id) without a total count."),
+    openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Opaque cursor from a `next`/`previous` link."),
+]
+
+EXCERPT_MAX_LENGTH = 1000
+
+
+def sparse_params(with_excerpt=True):
+    params = [
+        openapi.Parameter('fields', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                          description="Comma-separated fields to return, e.g. `id,title`."),
+        openapi.Parameter('exclude', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                          description="Comma-separated fields to leave out, e.g. `content`."),
+    ]
+    if with_excerpt:
+        params.append(openapi.Parameter('excerpt', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                                        description=f"Add an `excerpt` of the content, at most {EXCERPT_MAX_LENGTH} characters."))
+    return params
+
+
+def requested_fields(request, serializer_class):
+    """Serializer fields selected by the ``fields``/``exclude`` parameters, or None for all of them."""
+    available = serializer_class.Meta.fields
+
+    def parse(param):
+        if param not in request.query_params:
+            return None
+        names = {name.strip() for name in request.query_params[param].split(',') if name.strip()}
+        unknown = names.difference(available)
+        if unknown:
+            raise ValidationError({param: [f"Unknown field(s): {', '.join(sorted(unknown))}"]})
+        return names
+
+    fields, exclude = parse('fields'), parse('exclude')
+    if fields is None and exclude is None:
+        return None
+    return [name for name in available if (fields is None or name in fields) and name not in (exclude or ())]
+
+
+def requested_excerpt(request):
+    try:
+        length = int(request.query_params['excerpt'])
+    except (KeyError, ValueError):
+        return None
+    return min(length, EXCERPT_MAX_LENGTH) if length > 0 else None
+
+
+def sparse_queryset(queryset, fields, excerpt_length=None, required=()):
+    """Load only the columns behind ``fields`` (plus ``required``), and a prefix of the content for excerpts.
+
+    ``required`` takes field names or ordering names such as ``'-created_at'``.
+    """
+    if excerpt_length:
+        queryset = queryset.annotate(content_excerpt=Substr('content', 1, excerpt_length + 1))
+    if fields is None:
+        return queryset
+    columns = {field.name for field in queryset.model._meta.concrete_fields}
+    return queryset.only(*columns.intersection([*fields, *(name.lstrip('-') for name in required)]))
+
+
+def sparse_payload(payload, fields, excerpt_length=None):
+    """Trim a cached full payload the way the serializer would have."""
+    trimmed = payload if fields is None else {name: value for name, value in payload.items() if name in fields}
+    if excerpt_length:
+        trimmed = dict(trimmed, excerpt=excerpt(payload['content'], excerpt_length))
+    return trimmed
+
+
+def requested_liked_fields(request, serializer_class):
+    """``requested_fields``, keeping ``id`` whenever ``liked_by_me`` is selected so it can be set per viewer."""
+    fields = requested_fields(request, serializer_class)
+    if fields is not None and 'liked_by_me' in fields and 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
+
+
+def mark_liked_page(payload, user):
+    """Set ``liked_by_me`` on a blog list response, which is an empty list when there are no blogs."""
+    if isinstance(payload, dict):
+        likes.mark_liked(payload['results'], user)
+    return payload
+
+
+REPLIES_MAX = 50
+
+
+def replies_param(description):
+    return openapi.Parameter('replies', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description=(
+        f"{description} Each comes with its first `replies` replies (at most {REPLIES_MAX}) in thread order, "
+        "and `replies_count` for its whole thread."
+    ))
+
+
+def requested_replies(request):
+    try:
+        limit = int(request.query_params['replies'])
+    except (KeyError, ValueError):
+        return None
+    return min(limit, REPLIES_MAX) if limit > 0 else None
+
+
+def requested_thread(request):
+    if 'thread' not in request.query_params:
+        return None
+    try:
+        return int(request.query_params['thread'])
+    except ValueError:
+        raise ValidationError({'thread': ["A valid comment id is required."]})
+
+
+bulk_results_response = openapi.Response("Per-item results", openapi.Schema(type=openapi.TYPE_OBJECT, properties={
+    "results": openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT))
+}))
+
+like_state_response = openapi.Response("Success", openapi.Schema(type=openapi.TYPE_OBJECT, properties={
+    "message": openapi.Schema(type=openapi.TYPE_STRING),
+    "liked": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+    "likes_count": openapi.Schema(type=openapi.TYPE_INTEGER),
+}))
+
+
+def cached_blog_payloads(blog_ids):
+    """BlogSerializer payloads for ``blog_ids`` in order, from the per-blog cache where possible."""
+    payloads = cache.get_blog_payloads(blog_ids, 'by_id')
+    missing = [pk for pk in blog_ids if pk not in payloads]
+    if missing:
+        blogs = list(Blog.objects.filter(pk__in=missing))
+        fetched = {blog.pk: row for blog, row in zip(blogs, BlogSerializer(blogs, many=True).data)}
+        cache.set_blog_payloads(fetched, 'by_id')
+        payloads.update(fetched)
+    return [payloads[pk] for pk in blog_ids if pk in payloads]
+
+
 class BlogViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # Served from the read-only database alias, see blogging_project.dbrouters.
+    replica_actions = {'list_blogs', 'list_author_blogs', 'search', 'trending', 'get_blog_by_id', 'details', 'list_comments'}
+
+    def dispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        with replica_reads(action in self.replica_actions):
+            return super().dispatch(request, *args, **kwargs)
 
     def get_blog(self, pk):
         return get_object_or_404(Blog, pk=pk)
@@ -40,18 +216,107 @@ class BlogViewSet(viewsets.ViewSet):
     @swagger_auto_schema(
         operation_summary="List Blogs",
         operation_description="Retrieve a paginated list of all blogs.",
+        manual_parameters=pagination_params + sparse_params(),
         responses={200: BlogSerializer(many=True)}
     )
     @action(detail=False, methods=['get'])
     def list_blogs(self, request):
-        queryset = Blog.objects.filter(author__is_active=True).order_by('-created_at')
-        if queryset.exists():
+        cache_key = cache.list_cache_key(request)
+        payload = cache.get_list_payload(cache_key)
+        if payload is not None:
+            return Response(mark_liked_page(payload, request.user))
+        fields, excerpt_length = requested_liked_fields(request, BlogSerializer), requested_excerpt(request)
+        queryset = sparse_queryset(
+            Blog.objects.filter(is_visible=True).order_by('-created_at', '-id'), fields, excerpt_length,
+            required=BlogCursorPagination.ordering,
+        )
+        if uses_cursor_pagination(request):
+            paginator = BlogCursorPagination()
+        elif queryset.exists():
             paginator = BlogPagination()
-            page = paginator.paginate_queryset(queryset, request)
-            serializer = BlogSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
         else:
             return Response([], status=status.HTTP_200_OK)
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = BlogSerializer(page, many=True, fields=fields, excerpt_length=excerpt_length)
+        response = paginator.get_paginated_response(serializer.data)
+        cache.set_list_payload(cache_key, response.data)
+        mark_liked_page(response.data, request.user)
+        return response
+
+    @swagger_auto_schema(
+        operation_summary="List Author Blogs",
+        operation_description="Retrieve a paginated list of one author's blogs, newest first.",
+        manual_parameters=pagination_params,
+        responses={200: BlogSerializer(many=True), 404: "Author not found"}
+    )
+    @action(detail=False, methods=['get'], url_path=r'author/(?P<author_id>\d+)')
+    def list_author_blogs(self, request, author_id=None):
+        author = user_cache.get(int(author_id))
+        if author is None:
+            try:
+                author = user_cache.load(int(author_id))
+            except User.DoesNotExist:
+                pass
+        if author is None or not author.is_active:
+            return Response({"error": "Author not found"}, status=status.HTTP_404_NOT_FOUND)
+        # The first page is cached as blog ids; the blogs come from the per-blog cache,
+        # which likes and comments keep fresh.
+        cache_key = cache.author_page_key(request, author.pk)
+        page = cache.get_author_page(cache_key)
+        if page is not None:
+            return Response(dict(page, results=likes.mark_liked(cached_blog_payloads(page['results']), request.user)))
+        queryset = Blog.objects.filter(author_id=author.pk).order_by('-created_at', '-id')
+        if uses_cursor_pagination(request):
+            paginator = BlogCursorPagination()
+        elif queryset.exists():
+            paginator = BlogPagination()
+        else:
+            return Response([], status=status.HTTP_200_OK)
+        blogs = paginator.paginate_queryset(queryset, request)
+        results = BlogSerializer(blogs, many=True).data
+        response = paginator.get_paginated_response(results)
+        if cache_key is not None:
+            cache.set_blog_payloads({blog.pk: row for blog, row in zip(blogs, results)}, 'by_id')
+            cache.set_author_page(cache_key, dict(response.data, results=[blog.pk for blog in blogs]))
+        likes.mark_liked(results, request.user)
+        return response
+
+    @swagger_auto_schema(
+        operation_summary="Search Blogs",
+        operation_description="Full-text search over blog titles and content, best match first, with highlighted snippets.",
+        manual_parameters=[openapi.Parameter('q', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True)],
+        responses={200: BlogSearchSerializer(many=True), 400: "Missing query"}
+    )
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Query parameter 'q' is required"}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = search.search_blogs(Blog.objects.filter(is_visible=True), query)
+        paginator = BlogPagination()
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = BlogSearchSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_summary="Trending Blogs",
+        operation_description="Top blogs by recent likes and comments with time decay, hottest first.",
+        manual_parameters=[openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                                             description=f"Number of blogs, at most {settings.TRENDING_MAX_LIMIT}.")],
+        responses={200: TrendingBlogSerializer(many=True)}
+    )
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        try:
+            limit = int(request.query_params.get('limit', PAGE_SIZE_BLOGS))
+        except ValueError:
+            limit = PAGE_SIZE_BLOGS
+        limit = min(max(limit, 1), settings.TRENDING_MAX_LIMIT)
+        # Walks the trending score index, joining each row to its blog.
+        blogs = Blog.objects.filter(is_visible=True, trending__isnull=False).annotate(
+            score=F('trending__score')
+        ).order_by('-trending__score')[:limit]
+        return Response({"results": TrendingBlogSerializer(blogs, many=True, context={'request': request}).data})
 
     @swagger_auto_schema(
         operation_summary="Create Blog",
@@ -59,7 +324,7 @@ class BlogViewSet(viewsets.ViewSet):
         request_body=BlogSerializer,
         responses={201: BlogSerializer}
     )
-    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
     def create_blog(self, request):
         serializer = BlogSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
@@ -74,12 +339,24 @@ class BlogViewSet(viewsets.ViewSet):
     )
     @action(detail=True, methods=['get'])
     def get_blog_by_id(self, request, pk=None):
+        validators = conditional.blog_validators(request, pk)
+        if validators is not None:
+            view_counter.record(pk)
+        unchanged = conditional.not_modified(request, validators)
+        if unchanged is not None:
+            return unchanged
+        payload = cache.get_blog_payload(pk, 'by_id')
+        if payload is not None:
+            likes.mark_liked([payload], request.user)
+            return conditional.set_validators(Response(payload), validators)
         try:
             blog = self.get_blog(pk)
-            if not blog.author.is_active:
+            if not blog.is_visible:
                 return Response(None, status=status.HTTP_404_NOT_FOUND)
-            serializer = BlogSerializer(blog)
-            return Response(serializer.data)
+            payload = BlogSerializer(blog).data
+            cache.set_blog_payload(pk, 'by_id', payload)
+            likes.mark_liked([payload], request.user)
+            return conditional.set_validators(Response(payload), validators)
         except Blog.DoesNotExist:
             return Response(None, status=status.HTTP_404_NOT_FOUND)
 
@@ -89,7 +366,7 @@ class BlogViewSet(viewsets.ViewSet):
         request_body=BlogSerializer,
         responses={200: BlogSerializer, 403: "Forbidden", 404: "Not Found"}
     )
-    @action(detail=True, methods=['patch'], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=['patch'], permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
     def update_blog(self, request, pk=None):
         try:
             blog = self.get_blog(pk)
@@ -108,7 +385,7 @@ class BlogViewSet(viewsets.ViewSet):
         operation_description="Delete a blog post. **Only the author can delete.**",
         responses={200: "Blog deleted", 403: "Forbidden", 404: "Not Found"}
     )
-    @action(detail=True, methods=['delete'], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=['delete'], permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
     def delete_blog(self, request, pk=None):
         try:
             blog = self.get_blog(pk)
@@ -121,95 +398,184 @@ class BlogViewSet(viewsets.ViewSet):
 
     @swagger_auto_schema(
         operation_summary="Like Blog",
-        operation_description="Like a blog post. Creates a like if it doesn't already exist.",
-        responses={200: openapi.Response("Success", openapi.Schema(type=openapi.TYPE_OBJECT, properties={
-            "message": openapi.Schema(type=openapi.TYPE_STRING)
-        }))}
+        operation_description="Like a blog post. Liking it again changes nothing. Returns the current like count.",
+        responses={200: like_state_response, 404: "Not Found"}
     )
-    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
     def like_blog(self, request, pk=None):
-        blog = self.get_blog(pk)
-        if not blog.author.is_active:
+        likes_count = likes.like(request.user, int(pk)) if pk.isdigit() else None
+        if likes_count is None:
             return Response({"error": "Blog not found"}, status=status.HTTP_404_NOT_FOUND)
-        if Like.objects.filter(user=request.user, blog=blog).exists():
-            return Response({"message": "Blog liked"})
-        data = {'blog': blog.id}
-        serializer = LikeSerializer(data=data, context={'request': request})
-        if serializer.is_valid():
-            serializer.save()
-            return Response({"message": "Blog liked"})
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"message": "Blog liked", "liked": True, "likes_count": likes_count})
 
     @swagger_auto_schema(
         operation_summary="Unlike Blog",
-        operation_description="Remove a like from a blog post.",
-        responses={200: openapi.Response("Success", openapi.Schema(type=openapi.TYPE_OBJECT, properties={
-            "message": openapi.Schema(type=openapi.TYPE_STRING)
-        }))}
+        operation_description="Remove a like from a blog post. Unliking a blog that is not liked changes nothing. "
+                              "Returns the current like count.",
+        responses={200: like_state_response, 404: "Not Found"}
     )
-    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
     def unlike_blog(self, request, pk=None):
-        blog = self.get_blog(pk)
-        if not blog.author.is_active:
+        likes_count = likes.unlike(request.user, int(pk)) if pk.isdigit() else None
+        if likes_count is None:
             return Response({"error": "Blog not found"}, status=status.HTTP_404_NOT_FOUND)
-        Like.objects.filter(user=request.user, blog=blog).delete()
-        return Response({"message": "Blog unliked"})
+        return Response({"message": "Blog unliked", "liked": False, "likes_count": likes_count})
+
+    @swagger_auto_schema(
+        operation_summary="Bulk Like Blogs",
+        operation_description="Like many blogs at once. Returns one result per requested blog id.",
+        request_body=BulkBlogIdsSerializer,
+        responses={200: bulk_results_response}
+    )
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
+    def bulk_like(self, request):
+        serializer = BulkBlogIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({"results": bulk.bulk_like(request.user, serializer.validated_data['blog_ids'])})
+
+    @swagger_auto_schema(
+        operation_summary="Bulk Unlike Blogs",
+        operation_description="Remove likes from many blogs at once. Returns one result per requested blog id.",
+        request_body=BulkBlogIdsSerializer,
+        responses={200: bulk_results_response}
+    )
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
+    def bulk_unlike(self, request):
+        serializer = BulkBlogIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({"results": bulk.bulk_unlike(request.user, serializer.validated_data['blog_ids'])})
+
+    @swagger_auto_schema(
+        operation_summary="Bulk Add Comments",
+        operation_description="Add many comments (`{\"blog\": id, \"content\": ...}` items) in one request. "
+                              "Each item gets either the created comment or its validation errors.",
+        request_body=BulkCommentSerializer,
+        responses={200: bulk_results_response}
+    )
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
+    def bulk_comment(self, request):
+        serializer = BulkCommentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk.bulk_comment(request.user, serializer.validated_data['comments'], {'request': request})
+        return Response({"results": results})
 
     @swagger_auto_schema(
         operation_summary="Add Comment",
-        operation_description="Add a comment to a blog post. **Requires authentication**.",
+        operation_description="Add a comment to a blog post, or a reply to one of its comments with `parent`. **Requires authentication**.",
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             required=['content'],
-            properties={'content': openapi.Schema(type=openapi.TYPE_STRING)}
+            properties={
+                'content': openapi.Schema(type=openapi.TYPE_STRING),
+                'parent': openapi.Schema(type=openapi.TYPE_INTEGER, description="Id of the comment replied to."),
+            }
         ),
         responses={201: CommentSerializer}
     )
-    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
     def comment_blog(self, request, pk=None):
         blog = self.get_blog(pk)
-        if not blog.author.is_active:
+        if not blog.is_visible:
             return Response({"error": "Blog not found"}, status=status.HTTP_404_NOT_FOUND)
         serializer = CommentSerializer(data=request.data, context={'request': request, 'blog' : blog})
         if serializer.is_valid():
-            comment = serializer.save()
-            comment.save()
-            return Response(CommentSerializer(comment, context={'request': request}).data, status=status.HTTP_201_CREATED)
+            with transaction.atomic():
+                comment = serializer.save()
+                data = CommentSerializer(comment, context={'request': request}).data
+                events.publish_on_commit(blog.pk, 'comment', data)
+            return Response(data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @swagger_auto_schema(
         operation_summary="List Comments",
-        operation_description="Retrieve all comments for a blog (paginated).",
+        operation_description=(
+            "Retrieve all comments for a blog (paginated), newest first. With `thread`, the given comment and "
+            "every reply below it in thread order instead."
+        ),
+        manual_parameters=pagination_params + sparse_params(with_excerpt=False) + [
+            openapi.Parameter('thread', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Id of a comment whose whole subtree to list."),
+            replies_param("List top-level comments only."),
+        ],
         responses={200: CommentSerializer(many=True)}
     )
     @action(detail=True, methods=['get'])
     def list_comments(self, request, pk=None):
+        validators = conditional.blog_validators(request, pk, weak=True)
+        unchanged = conditional.not_modified(request, validators)
+        if unchanged is not None:
+            return unchanged
         blog = self.get_blog(pk)
-        if not blog.author.is_active:
+        if not blog.is_visible:
             return Response([], status=status.HTTP_200_OK)
-        queryset = blog.comments.filter(user__is_active=True).order_by('-created_at')
-        if queryset.exists():
+        thread, replies = requested_thread(request), requested_replies(request)
+        serializer_class = ThreadedCommentSerializer if replies and thread is None else CommentSerializer
+        fields = requested_fields(request, serializer_class)
+        comments = blog.comments.filter(is_visible=True)
+        cursor_pagination_class = CommentCursorPagination
+        if thread is not None:
+            # The whole subtree is one range of the (blog, path) index.
+            root = get_object_or_404(comments.only('blog', 'path'), pk=thread)
+            queryset = comments.filter(threads.subtree(root.path)).order_by('path')
+            cursor_pagination_class = ThreadCursorPagination
+        elif replies:
+            queryset = comments.filter(parent__isnull=True).order_by('-created_at', '-id')
+        else:
+            queryset = comments.order_by('-created_at', '-id')
+        # The related manager reads blog_id back on every row it loads.
+        queryset = sparse_queryset(queryset, fields, required=[*cursor_pagination_class.ordering, 'path', 'blog'])
+        if uses_cursor_pagination(request):
+            paginator = cursor_pagination_class()
+        elif queryset.exists():
             paginator = CommentPagination()
-            page = paginator.paginate_queryset(queryset, request)
-            serializer = CommentSerializer(page, many=True, context={'request': request})
-            return paginator.get_paginated_response(serializer.data)
         else:
-            return Response([], status=status.HTTP_200_OK)
+            return conditional.set_validators(Response([], status=status.HTTP_200_OK), validators)
+        page = paginator.paginate_queryset(queryset, request)
+        if serializer_class is ThreadedCommentSerializer:
+            threads.attach_replies(page, comments, replies)
+        serializer = serializer_class(page, many=True, fields=fields, context={'request': request})
+        return conditional.set_validators(paginator.get_paginated_response(serializer.data), validators)
 
     @swagger_auto_schema(
         operation_summary="Blog Details",
         operation_description="Retrieve blog details with the latest comments.",
+        manual_parameters=sparse_params() + [replies_param("Show the latest top-level comments only.")],
         responses={200: BlogDetailSerializer}
     )
     @action(detail=True, methods=['get'])
     def details(self, request, pk=None):
-        blog = self.get_blog(pk)
-        if not blog.author.is_active:
+        validators = conditional.blog_validators(request, pk, weak=True)
+        if validators is not None:
+            view_counter.record(pk)
+        unchanged = conditional.not_modified(request, validators)
+        if unchanged is not None:
+            return unchanged
+        fields, excerpt_length = requested_fields(request, BlogDetailSerializer), requested_excerpt(request)
+        replies = requested_replies(request)
+        payload = None if replies else cache.get_blog_payload(pk, 'details')
+        if payload is not None:
+            payload = likes.mark_liked([sparse_payload(payload, fields, excerpt_length)], request.user, [int(pk)])[0]
+            return conditional.set_validators(Response(payload), validators)
+        # Only the full flat representation is cached, others are loaded as requested instead.
+        sparse = fields is not None or excerpt_length is not None or replies is not None
+        blog = get_object_or_404(sparse_queryset(Blog.objects.all(), fields, excerpt_length, required=['author', 'is_visible']), pk=pk)
+        if not blog.is_visible:
             return Response(None, status=status.HTTP_404_NOT_FOUND)
-        latest_comments = blog.comments.filter(user__is_active=True).order_by('-created_at')[:COMMENTS_ON_DETAIL_BLOG]
-        blog_data = BlogDetailSerializer(blog, context={'request': request}).data
-        blog_data['latest_comments'] = CommentSerializer(latest_comments if latest_comments else [], many=True, context={'request': request}).data
-        return Response(blog_data)
+        latest_comments = []
+        if fields is None or 'latest_comments' in fields:
+            comments = blog.comments.filter(is_visible=True)
+            latest = comments.filter(parent__isnull=True) if replies else comments
+            latest_comments = list(latest.order_by('-created_at', '-id')[:COMMENTS_ON_DETAIL_BLOG])
+            if replies:
+                threads.attach_replies(latest_comments, comments, replies)
+        blog_data = BlogDetailSerializer(
+            blog, fields=fields, excerpt_length=excerpt_length,
+            context={'latest_comments': latest_comments, 'threaded': bool(replies)},
+        ).data
+        if not sparse:
+            cache.set_blog_payload(pk, 'details', blog_data)
+        likes.mark_liked([blog_data], request.user, [blog.pk])
+        return conditional.set_validators(Response(blog_data), validators)
 
     @swagger_auto_schema(
         operation_summary="Update Comment",
@@ -217,7 +583,7 @@ class BlogViewSet(viewsets.ViewSet):
         request_body=CommentSerializer,
         responses={200: CommentSerializer, 403: "Forbidden", 404: "Not Found"}
     )
-    @action(detail=True, methods=['patch'], url_path='update_comment/(?P<comment_id>[^/.]+)', permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=['patch'], url_path='update_comment/(?P<comment_id>[^/.]+)', permission_classes=[permissions.IsAuthenticated], throttle_classes=write_throttles)
     def update_comment(self, request, pk=None, comment_id=None):
         comment = get_object_or_404(Comment, pk=comment_id)
         if comment.user != request.user:
@@ -225,5 +591,31 @@ class BlogViewSet(viewsets.ViewSet):
         serializer = CommentSerializer(comment, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
             comment = serializer.save()
-            return Response(CommentSerializer(comment, context={'request': request}).data)
+            data = CommentSerializer(comment, context={'request': request}).data
+            events.publish_on_commit(comment.blog_id, 'comment_updated', data)
+            return Response(data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @swagger_auto_schema(
+        operation_summary="Export Blogs",
+        operation_description="Stream every blog with its comments and like count as NDJSON, one blog per line. **Admin only.**",
+        responses={200: openapi.Response("NDJSON stream", schema=openapi.Schema(type=openapi.TYPE_STRING))}
+    )
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def export(self, request):
+        lines = export.aiter_ndjson() if isinstance(request._request, ASGIRequest) else export.iter_ndjson()
+        response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="blogs.ndjson"'
+        return response
+
+    @swagger_auto_schema(
+        operation_summary="Blog Stats",
+        operation_description=(
+            "Response cache hit/miss, write throttle admitted/rejected and event stream counters of the serving worker. "
+            "**Admin only.**"
+        ),
+        responses={200: openapi.Response("Stats", openapi.Schema(type=openapi.TYPE_OBJECT))}
+    )
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def stats(self, request):
+        return Response({"cache": cache.stats(), "throttle": throttling.stats(), "events": events.hub.stats()})
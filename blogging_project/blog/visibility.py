@@ -0,0 +1,44 @@
+"""The denormalized ``is_visible`` flag of blogs and comments.
+
+A blog is visible while its author is active, a comment while its writer
+is. Reads filter on the flag of the row itself instead of joining users.
+It is flipped when a user is deactivated or reactivated, a chunk of rows
+per UPDATE and transaction, so a prolific user never holds the database
+writer for long. Every blog affected gets its ``last_activity_at`` stamped,
+which changes its HTTP validators along with its content.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import Blog, Comment
+
+
+def _flip(queryset, visible, blog_field, chunk_size):
+    # Rows already flipped drop out of the filter, each pass takes the next chunk.
+    touched = set()
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.filter(is_visible=not visible).values_list('pk', blog_field)[:chunk_size])
+            if not rows:
+                return touched
+            queryset.model.objects.filter(pk__in=[pk for pk, _ in rows]).update(is_visible=visible)
+        touched.update(blog_id for _, blog_id in rows)
+
+
+def set_user_visibility(user, chunk_size=None):
+    """Make the blogs and comments of ``user`` follow its ``is_active``; returns the ids of blogs affected."""
+    chunk_size = chunk_size or settings.VISIBILITY_CHUNK_SIZE
+    blog_ids = _flip(Blog.objects.filter(author_id=user.pk), user.is_active, 'pk', chunk_size)
+    blog_ids |= _flip(Comment.objects.filter(user_id=user.pk), user.is_active, 'blog_id', chunk_size)
+    now, touched = timezone.now(), sorted(blog_ids)
+    for start in range(0, len(touched), chunk_size):
+        Blog.objects.filter(pk__in=touched[start:start + chunk_size]).update(last_activity_at=now)
+    return blog_ids
+
+
+def refresh_visibility(blog_ids):
+    """Recompute the flag of the given blogs and their comments from their authors, set-wise."""
+    Blog.objects.filter(pk__in=blog_ids, is_visible=False, author__is_active=True).update(is_visible=True)
+    Blog.objects.filter(pk__in=blog_ids, is_visible=True, author__is_active=False).update(is_visible=False)
+    Comment.objects.filter(blog_id__in=blog_ids, is_visible=False, user__is_active=True).update(is_visible=True)
+    Comment.objects.filter(blog_id__in=blog_ids, is_visible=True, user__is_active=False).update(is_visible=False)
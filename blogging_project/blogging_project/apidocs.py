@@ -0,0 +1,167 @@
+"""OpenAPI documentation without loading drf_yasg in every worker.
+
+Views describe their operations with ``swagger_auto_schema`` and ``openapi``
+from this module instead of drf_yasg's. Both only record what they are
+given: drf_yasg is imported, and the records turned into real drf_yasg
+objects, the first time a schema is generated, by the docs views below or
+by ``manage.py build_openapi_schema``. Once that command has written
+OPENAPI_SCHEMA_FILE the JSON schema is served from it with caching headers,
+and the docs UIs read it from there too.
+"""
+import hashlib
+import importlib
+import os
+import threading
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import permissions
+
+API_INFO = dict(
+    title="Plutonic Blogging API",
+    default_version='v1',
+    description="A comprehensive blogging platform API with user authentication, blog management, and social features",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact={'email': "contact@plutonic-blog.com"},
+    license={'name': "BSD License"},
+)
+
+
+class Deferred:
+    """A ``drf_yasg.openapi`` attribute, or a call of one, looked up when the schema is first generated."""
+
+    __slots__ = ('name', 'args', 'kwargs', 'called')
+
+    def __init__(self, name, args=(), kwargs=None, called=False):
+        self.name, self.args, self.kwargs, self.called = name, args, kwargs or {}, called
+
+    def __call__(self, *args, **kwargs):
+        return Deferred(self.name, args, kwargs, called=True)
+
+    def __repr__(self):
+        return f"openapi.{self.name}{'(...)' if self.called else ''}"
+
+    def resolve(self):
+        target = getattr(importlib.import_module('drf_yasg.openapi'), self.name)
+        return target(*resolve(self.args), **resolve(self.kwargs)) if self.called else target
+
+
+class _OpenAPI:
+    """Stand-in for the ``drf_yasg.openapi`` module."""
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return Deferred(name)
+
+
+openapi = _OpenAPI()
+
+
+def resolve(value):
+    if isinstance(value, Deferred):
+        return value.resolve()
+    if isinstance(value, (list, tuple)):
+        return type(value)(resolve(item) for item in value)
+    if isinstance(value, dict):
+        return {key: resolve(item) for key, item in value.items()}
+    return value
+
+
+_lock = threading.Lock()
+_pending = []
+_docs_views = None
+
+
+def swagger_auto_schema(**overrides):
+    """Record drf_yasg's ``swagger_auto_schema`` for ``view_method``, applied by ``install``."""
+    def decorator(view_method):
+        _pending.append((view_method, overrides))
+        return view_method
+    return decorator
+
+
+def install():
+    """Import drf_yasg and apply every recorded decorator, once."""
+    from drf_yasg.utils import swagger_auto_schema as decorate
+    with _lock:
+        while _pending:
+            view_method, overrides = _pending.pop()
+            decorate(**resolve(overrides))(view_method)
+
+
+def api_info():
+    from drf_yasg import openapi as yasg_openapi
+    return yasg_openapi.Info(**dict(
+        API_INFO, contact=yasg_openapi.Contact(**API_INFO['contact']), license=yasg_openapi.License(**API_INFO['license']),
+    ))
+
+
+def generate_schema(url=None):
+    """The complete, public schema, as generated for ``/swagger.json``."""
+    from drf_yasg.generators import OpenAPISchemaGenerator
+    install()
+    return OpenAPISchemaGenerator(api_info(), url=url).get_schema(request=None, public=True)
+
+
+def docs_views():
+    """drf_yasg's schema and UI views, built on first use."""
+    global _docs_views
+    if _docs_views is None:
+        from drf_yasg.views import get_schema_view
+        install()
+        view = get_schema_view(api_info(), public=True, permission_classes=(permissions.AllowAny,))
+        timeout = settings.OPENAPI_SCHEMA_MAX_AGE
+        _docs_views = {
+            'schema': view.without_ui(cache_timeout=timeout),
+            'swagger': view.with_ui('swagger', cache_timeout=timeout),
+            'redoc': view.with_ui('redoc', cache_timeout=timeout),
+        }
+    return _docs_views
+
+
+class _SchemaFile:
+    """The built schema file, re-read when its modification time changes."""
+
+    def __init__(self):
+        self.key = None
+        self.loaded = None
+
+    def load(self):
+        """``(content, etag)`` of the file, or None when it has not been built."""
+        path = settings.OPENAPI_SCHEMA_FILE
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key != self.key:
+            with open(path, 'rb') as source:
+                content = source.read()
+            self.loaded, self.key = (content, f'"{hashlib.sha256(content).hexdigest()[:32]}"'), key
+        return self.loaded
+
+
+schema_file = _SchemaFile()
+
+
+def schema(request, format):
+    built = schema_file.load() if format == '.json' else None
+    if built is None:
+        # Not built yet, or YAML: generated by drf_yasg and kept in the cache for as long.
+        return docs_views()['schema'](request, format=format)
+    content, etag = built
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.OPENAPI_SCHEMA_MAX_AGE)
+    return response
+
+
+def swagger_ui(request):
+    return docs_views()['swagger'](request)
+
+
+def redoc(request):
+    return docs_views()['redoc'](request)
@@ -0,0 +1,57 @@
+"""Read/write splitting between the primary database and a read-only alias.
+
+Reads are only sent to DATABASE_READ_ALIAS inside ``replica_reads()``,
+which BlogViewSet enters for its read actions. Everything else, all writes
+and any read made while the primary is inside a transaction go to the
+primary, so a request never reads older data than it has just written.
+"""
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _read_alias.set(settings.DATABASE_READ_ALIAS if enabled else None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def reads_from_replica(view):
+    """Run a (sync or async) function view inside ``replica_reads()``."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            with replica_reads():
+                return await view(*args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with replica_reads():
+                return view(*args, **kwargs)
+    return wrapper
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # Explicit, otherwise instances loaded from the replica would be saved back to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,150 @@
+"""Per-request SQL, serializer and auth timing, reported as Server-Timing headers.
+
+A single execute wrapper is attached to every database connection when it
+is opened and does nothing unless a request is being measured, so the
+middleware can stay enabled permanently. Measurements live in a context
+variable, which follows requests into async views and their ORM threads.
+"""
+import contextvars
+import json
+import logging
+import time
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('blogging_project.slow_sql')
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('request', 'started', 'queries', 'db', 'timers', 'depth')
+
+    def __init__(self, request):
+        self.request = request
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.timers = {}
+        self.depth = {}
+
+    def server_timing(self):
+        parts = [f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"']
+        parts.extend(f'{name};dur={seconds * 1000:.2f}' for name, seconds in self.timers.items())
+        parts.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.2f}')
+        return ', '.join(parts)
+
+
+def action_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view_class = getattr(match.func, 'cls', None)
+    actions = getattr(match.func, 'actions', None) or {}
+    if view_class is None:
+        return match.view_name
+    action = actions.get(request.method.lower(), request.method.lower())
+    return f'{view_class.__name__}.{action}'
+
+
+@contextmanager
+def timed(name):
+    """Add the wall time of the block to the current request's ``name`` timer.
+
+    Nested blocks with the same name are only counted once.
+    """
+    metrics = _current.get()
+    if metrics is None or metrics.depth.get(name):
+        yield
+        return
+    metrics.depth[name] = 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.depth[name] = 0
+        metrics.timers[name] = metrics.timers.get(name, 0.0) + time.perf_counter() - started
+
+
+def _log_slow_query(metrics, sql, duration, alias):
+    logger.warning(json.dumps({
+        'event': 'slow_query',
+        'duration_ms': round(duration * 1000, 2),
+        'database': alias,
+        'action': action_name(metrics.request),
+        'method': metrics.request.method,
+        'path': metrics.request.path,
+        'sql': sql,
+    }))
+
+
+def _make_execute_wrapper(alias):
+    def execute_wrapper(execute, sql, params, many, context):
+        metrics = _current.get()
+        if metrics is None:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            metrics.queries += 1
+            metrics.db += duration
+            if duration * 1000 >= settings.SLOW_QUERY_MS:
+                _log_slow_query(metrics, sql, duration, alias)
+    execute_wrapper.instrumentation = True
+    return execute_wrapper
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    if not any(getattr(wrapper, 'instrumentation', False) for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(_make_execute_wrapper(connection.alias))
+
+
+connection_created.connect(install_execute_wrapper)
+
+
+class TimedSerializerMixin:
+    """Counts serializer ``to_representation`` time towards the ``ser`` timer."""
+
+    def to_representation(self, instance):
+        with timed('ser'):
+            return super().to_representation(instance)
+
+
+class QueryInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # Connections opened before the middleware was loaded missed connection_created.
+        for connection in connections.all(initialized_only=True):
+            install_execute_wrapper(None, connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics(request)
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        response['Server-Timing'] = metrics.server_timing()
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics(request)
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        response['Server-Timing'] = metrics.server_timing()
+        return response
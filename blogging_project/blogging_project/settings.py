@@ -48,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blogging_project.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,13 +82,129 @@ WSGI_APPLICATION = 'blogging_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# The database is in WAL mode, set once by migration blog.0011_sqlite_wal:
+# readers proceed while a writer commits. Every connection runs the pragmas
+# below: busy_timeout makes a writer wait for the lock instead of failing
+# with "database is locked", and IMMEDIATE transactions take the write lock
+# up front so that wait happens at BEGIN rather than as an unretryable
+# lock upgrade mid-transaction. Connections are kept for CONN_MAX_AGE seconds.
+# Reads of BlogViewSet's read actions go to the read-only `replica` alias, the
+# same file opened with query_only; set DATABASE_READ_ALIAS empty to disable.
+
+SQLITE_PRAGMAS = [
+    f"synchronous={os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+    f"busy_timeout={int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+    f"mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+    # Negative values are KiB rather than pages.
+    f"cache_size={int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024))}",
+    'temp_store=MEMORY',
+]
+DATABASE_CONN_MAX_AGE = int(os.getenv('DATABASE_CONN_MAX_AGE', 600))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': os.getenv('SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+            'init_command': ';'.join(f'PRAGMA {pragma}' for pragma in SQLITE_PRAGMAS),
+        },
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {pragma}' for pragma in SQLITE_PRAGMAS + ['query_only=ON']),
+        },
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['blogging_project.dbrouters.ReadReplicaRouter']
+DATABASE_READ_ALIAS = os.getenv('DATABASE_READ_ALIAS', 'replica') or None
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# CACHE_BACKEND may be any Django backend, e.g. locmem.LocMemCache,
+# filebased.FileBasedCache (CACHE_LOCATION=/path) or db.DatabaseCache
+# (CACHE_LOCATION=table name, then run `manage.py createcachetable`).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.' + os.getenv('CACHE_BACKEND', 'locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'plutonic'),
     }
 }
 
+BLOG_CACHE_ALIAS = os.getenv('BLOG_CACHE_ALIAS', 'default')
+BLOG_CACHE_TIMEOUT = int(os.getenv('BLOG_CACHE_TIMEOUT', 300))
+BLOG_CACHE_LIST_PAGES = int(os.getenv('BLOG_CACHE_LIST_PAGES', 3))
+
+
+# Blog view counting, buffered per process and flushed in batches.
+VIEW_COUNT_ENABLED = os.getenv('VIEW_COUNT_ENABLED', 'False').lower() in ('1', 'true', 'yes')
+VIEW_COUNT_FLUSH_SIZE = int(os.getenv('VIEW_COUNT_FLUSH_SIZE', 500))
+VIEW_COUNT_FLUSH_INTERVAL = float(os.getenv('VIEW_COUNT_FLUSH_INTERVAL', 5))
+
+
+# Trending feed: scores halve every TRENDING_HALF_LIFE_HOURS once
+# `manage.py decay_trending` runs, rows below TRENDING_MIN_SCORE are dropped.
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', 24))
+TRENDING_LIKE_WEIGHT = float(os.getenv('TRENDING_LIKE_WEIGHT', 1))
+TRENDING_COMMENT_WEIGHT = float(os.getenv('TRENDING_COMMENT_WEIGHT', 3))
+TRENDING_WINDOW_HOURS = int(os.getenv('TRENDING_WINDOW_HOURS', 7 * 24))
+TRENDING_MIN_SCORE = float(os.getenv('TRENDING_MIN_SCORE', 0.01))
+TRENDING_MAX_LIMIT = int(os.getenv('TRENDING_MAX_LIMIT', 100))
+
+
+# Statements slower than this are written to the `blogging_project.slow_sql` log.
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 100))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'blogging_project.slow_sql': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+
+# Token-bucket throttles on write actions: "<tokens>/<s|min|h|day>" refill
+# rate and burst size, per user and across all users. Empty disables a bucket.
+THROTTLE_CACHE_ALIAS = os.getenv('THROTTLE_CACHE_ALIAS', 'default')
+WRITE_THROTTLE_USER_RATE = os.getenv('WRITE_THROTTLE_USER_RATE', '60/min')
+WRITE_THROTTLE_USER_BURST = int(os.getenv('WRITE_THROTTLE_USER_BURST', 20))
+WRITE_THROTTLE_GLOBAL_RATE = os.getenv('WRITE_THROTTLE_GLOBAL_RATE', '200/s')
+WRITE_THROTTLE_GLOBAL_BURST = int(os.getenv('WRITE_THROTTLE_GLOBAL_BURST', 400))
+
+
+# Rows per UPDATE when a user's blogs and comments are hidden or shown again.
+VISIBILITY_CHUNK_SIZE = int(os.getenv('VISIBILITY_CHUNK_SIZE', 500))
+
+
+# Server-Sent Events of blog activity (blog.events): heartbeat interval in
+# seconds, client reconnect delay, events kept per blog for Last-Event-ID
+# resume and how many blogs keep them, events a slow reader may fall behind
+# before it is disconnected, and open streams per worker.
+SSE_HEARTBEAT = int(os.getenv('SSE_HEARTBEAT', 15))
+SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', 3000))
+SSE_HISTORY = int(os.getenv('SSE_HISTORY', 100))
+SSE_HISTORY_BLOGS = int(os.getenv('SSE_HISTORY_BLOGS', 10000))
+SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', 256))
+SSE_MAX_SUBSCRIBERS = int(os.getenv('SSE_MAX_SUBSCRIBERS', 10000))
+
+
+# Upper bound on items accepted by the bulk like/unlike/comment actions.
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 500))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -108,6 +225,27 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# New and upgraded hashes use scrypt with the cost below; hashes made by the
+# other hashers still verify and are rehashed on the next successful login.
+
+PASSWORD_HASHERS = [
+    'user_auth.hashers.ScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv('PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 14))
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os.getenv('PASSWORD_SCRYPT_BLOCK_SIZE', 8))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv('PASSWORD_SCRYPT_PARALLELISM', 1))
+
+# Process pool used for login and registration hashing (0 workers hashes inline).
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', 2))
+PASSWORD_HASHING_QUEUE = int(os.getenv('PASSWORD_HASHING_QUEUE', 32))
+PASSWORD_HASHING_TIMEOUT = float(os.getenv('PASSWORD_HASHING_TIMEOUT', 5))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -132,13 +270,28 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user_auth.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ]
 }
 
+PAGE_SIZE_BLOGS = int(os.getenv('PAGE_SIZE_BLOGS', 5))
+MAX_PAGE_SIZE_BLOGS = int(os.getenv('MAX_PAGE_SIZE_BLOGS', 50))
+PAGE_SIZE_COMMENTS = int(os.getenv('PAGE_SIZE_COMMENTS', 5))
+MAX_PAGE_SIZE_COMMENTS = int(os.getenv('MAX_PAGE_SIZE_COMMENTS', 50))
+COMMENTS_ON_DETAIL_BLOG = int(os.getenv('COMMENTS_ON_DETAIL_BLOG', 5))
+# Size of the `recent_likers` sample on blog payloads.
+RECENT_LIKERS = int(os.getenv('RECENT_LIKERS', 3))
+
+# OpenAPI docs, see blogging_project.apidocs. `manage.py build_openapi_schema`
+# writes the schema to OPENAPI_SCHEMA_FILE, /swagger.json then serves that file.
+OPENAPI_SCHEMA_FILE = os.getenv('OPENAPI_SCHEMA_FILE', str(BASE_DIR / 'openapi.json'))
+OPENAPI_SCHEMA_MAX_AGE = int(os.getenv('OPENAPI_SCHEMA_MAX_AGE', 3600))
+SWAGGER_SETTINGS = {'SPEC_URL': ('schema-json', {'format': '.json'})}
+REDOC_SETTINGS = {'SPEC_URL': ('schema-json', {'format': '.json'})}
+
 from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
@@ -164,4 +317,8 @@ SIMPLE_JWT = {
     'JTI_CLAIM': 'jti',
 }
 
-AUTH_USER_MODEL = 'user_auth.User'
\ No newline at end of file
+AUTH_USER_MODEL = 'user_auth.User'
+
+# Slim user records kept per worker by CachedJWTAuthentication.
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', 10000))
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 60))
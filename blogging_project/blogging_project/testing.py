@@ -0,0 +1,39 @@
+"""Test case base classes shared by the apps' test suites."""
+from django.core.cache import caches
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from user_auth.authentication import user_cache
+from blog.perf import seed_dataset
+
+
+class QueryBudgetTestCase(TestCase):
+    """Base class asserting hard SQL query budgets per endpoint on a seeded dataset.
+
+    Caches are cleared before every test so budgets cover the cold path. A
+    budget that starts failing usually means an N+1 query was reintroduced.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed_dataset(users=12, blogs=30, likes=6, comments=8, spare_blogs=1)
+
+    def setUp(self):
+        caches[settings.BLOG_CACHE_ALIAS].clear()
+        user_cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.dataset.admin).access_token}')
+
+    def assertQueryBudget(self, budget, method, path, data=None, status=200, **extra):
+        with CaptureQueriesContext(connection) as captured:
+            response = getattr(self.client, method)(path, data, format='json' if method != 'get' else None, **extra)
+        self.assertEqual(response.status_code, status, response.content[:500])
+        self.assertLessEqual(
+            len(captured), budget,
+            f"{method.upper()} {path} ran {len(captured)} queries (budget {budget}):\n"
+            + '\n'.join(query['sql'] for query in captured),
+        )
+        return len(captured)
@@ -0,0 +1,136 @@
+"""Token-bucket admission control for write actions.
+
+Each bucket refills at its configured rate ("<tokens>/<s|min|h|day>") up to
+its burst size, and every admitted write takes a token. Buckets live in the
+THROTTLE_CACHE_ALIAS cache, so they are shared by all worker processes when
+that cache is (file, database or memcached backends). Like DRF's own
+throttles the update is not atomic, so concurrent writers may occasionally
+both take the last token. A bucket whose rate is empty never throttles.
+"""
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def parse_rate(rate):
+    """``'60/min'`` -> tokens per second, None for an empty rate."""
+    if not rate:
+        return None
+    tokens, period = rate.split('/')
+    return int(tokens) / PERIODS[period]
+
+
+def _record(scope, outcome, amount=1):
+    with _stats_lock:
+        _stats.setdefault(scope, {'admitted': 0, 'rejected': 0})[outcome] += amount
+
+
+def stats():
+    """Admitted/rejected write counts of this worker process, per bucket scope."""
+    with _stats_lock:
+        return {scope: dict(counters) for scope, counters in _stats.items()}
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """A token bucket kept as its "theoretical arrival time" (GCRA), a single cached float per key."""
+
+    scope = None
+    rate_setting = None
+    burst_setting = None
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError
+
+    def take(self, request, view):
+        """Take a token; returns 0 when one was available, else the seconds until one is."""
+        self._taken = None
+        rate = parse_rate(getattr(settings, self.rate_setting))
+        if rate is None:
+            return 0
+        interval = 1 / rate
+        capacity = getattr(settings, self.burst_setting) * interval
+        key = f'throttle:{self.scope}:{self.get_cache_key(request, view)}'
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        now = time.time()
+        arrival = max(cache.get(key, now), now) + interval
+        if arrival - now > capacity:
+            _record(self.scope, 'rejected')
+            return arrival - now - capacity
+        cache.set(key, arrival, int(capacity) + 1)
+        self._taken = (key, arrival - interval, int(capacity) + 1)
+        _record(self.scope, 'admitted')
+        return 0
+
+    def refund(self):
+        """Give back the token the last ``take`` took, for a write refused further on."""
+        if self._taken is not None:
+            key, arrival, timeout = self._taken
+            caches[settings.THROTTLE_CACHE_ALIAS].set(key, arrival, timeout)
+            self._taken = None
+            _record(self.scope, 'admitted', -1)
+
+    def allow_request(self, request, view):
+        self._wait = self.take(request, view)
+        return not self._wait
+
+    def wait(self):
+        return self._wait
+
+
+class UserWriteThrottle(TokenBucketThrottle):
+    """One bucket per authenticated user, or per client address for anonymous writes."""
+
+    scope = 'write_user'
+    rate_setting = 'WRITE_THROTTLE_USER_RATE'
+    burst_setting = 'WRITE_THROTTLE_USER_BURST'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+
+class GlobalWriteThrottle(TokenBucketThrottle):
+    """A single bucket shared by every writer, sized to what the database writer sustains."""
+
+    scope = 'write_global'
+    rate_setting = 'WRITE_THROTTLE_GLOBAL_RATE'
+    burst_setting = 'WRITE_THROTTLE_GLOBAL_BURST'
+
+    def get_cache_key(self, request, view):
+        return 'all'
+
+
+class WriteThrottle(BaseThrottle):
+    """The writer's own bucket first, then the global one.
+
+    DRF asks every throttle of a view even after one has refused, so the
+    two buckets are checked here instead: a write refused by the user bucket
+    never takes a global token, and one refused by the global bucket gets
+    its user token back. A client retrying past its own limit cannot drain
+    the shared bucket for everyone else.
+    """
+
+    def allow_request(self, request, view):
+        user_bucket = UserWriteThrottle()
+        self._wait = user_bucket.take(request, view)
+        if self._wait:
+            return False
+        self._wait = GlobalWriteThrottle().take(request, view)
+        if self._wait:
+            user_bucket.refund()
+            return False
+        return True
+
+    def wait(self):
+        return self._wait
+
+
+write_throttles = [WriteThrottle]
@@ -2,23 +2,10 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
 from blog.views import BlogViewSet
+from blog import async_views as blog_async_views
 from user_auth.views import AuthViewSet
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Plutonic Blogging API",
-        default_version='v1',
-        description="A comprehensive blogging platform API with user authentication, blog management, and social features",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@plutonic-blog.com"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from user_auth import async_views as auth_async_views
+from blogging_project import apidocs
 
 router = DefaultRouter()
 router.register(r'blogs', BlogViewSet, basename='blogs')
@@ -27,9 +14,17 @@ router.register(r'auth', AuthViewSet, basename='auth')
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include(router.urls)),
+
+    # Async read endpoints, native under ASGI
+    path('api/async/blogs/list_blogs/', blog_async_views.list_blogs, name='async-list-blogs'),
+    path('api/async/blogs/<int:pk>/get_blog_by_id/', blog_async_views.get_blog_by_id, name='async-get-blog-by-id'),
+    path('api/async/blogs/<int:pk>/details/', blog_async_views.details, name='async-blog-details'),
+    path('api/async/blogs/<int:pk>/list_comments/', blog_async_views.list_comments, name='async-list-comments'),
+    path('api/async/blogs/<int:pk>/events/', blog_async_views.blog_events, name='async-blog-events'),
+    path('api/async/auth/me/', auth_async_views.me, name='async-me'),
     
-    # Swagger Documentation URLs
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    # Swagger Documentation URLs, drf_yasg is only loaded by workers that serve them
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$', apidocs.schema, name='schema-json'),
+    path('swagger/', apidocs.swagger_ui, name='schema-swagger-ui'),
+    path('redoc/', apidocs.redoc, name='schema-redoc'),
 ]
@@ -0,0 +1,18 @@
+from django.http import JsonResponse
+from rest_framework import exceptions
+from user_auth.authentication import CachedJWTAuthentication
+from .serializers import UserSerializer
+
+
+async def me(request):
+    authenticator = CachedJWTAuthentication()
+    try:
+        result = await authenticator.aauthenticate(request)
+    except exceptions.AuthenticationFailed as exc:
+        response = JsonResponse({"detail": exc.detail}, status=exc.status_code)
+    else:
+        if result is not None:
+            return JsonResponse(UserSerializer(result[0]).data)
+        response = JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    response['WWW-Authenticate'] = authenticator.authenticate_header(request)
+    return response
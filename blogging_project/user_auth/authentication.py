@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from blogging_project.instrumentation import timed
+from user_auth.models import User
+
+SLIM_USER_FIELDS = ('id', 'username', 'email', 'is_active', 'is_staff', 'is_superuser', 'created_by')
+
+
+class UserCache:
+    """Bounded LRU of slim user rows with a per-entry TTL, local to the worker process."""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.attnames = [f.attname for f in User._meta.concrete_fields if f.name in SLIM_USER_FIELDS]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # A fresh instance per request, so callers never share mutable state.
+        return User.from_db('default', self.attnames, values)
+
+    def load(self, user_id):
+        return self._store(User.objects.only(*SLIM_USER_FIELDS).get(pk=user_id))
+
+    async def aload(self, user_id):
+        return self._store(await User.objects.only(*SLIM_USER_FIELDS).aget(pk=user_id))
+
+    def _store(self, user):
+        values = tuple(getattr(user, attname) for attname in self.attnames)
+        with self._lock:
+            self._entries[user.pk] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user.pk)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the user claim through ``user_cache`` instead of a query per request."""
+
+    def authenticate(self, request):
+        with timed('auth'):
+            return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != 'id':
+            return super().get_user(validated_token)
+        user_id = self._user_id(validated_token)
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = user_cache.load(user_id)
+            except User.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        return self._check_user(user)
+
+    async def aget_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != 'id':
+            return await sync_to_async(super().get_user)(validated_token)
+        user_id = self._user_id(validated_token)
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = await user_cache.aload(user_id)
+            except User.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        return self._check_user(user)
+
+    async def aauthenticate(self, request):
+        """Async counterpart of ``authenticate`` for plain Django async views."""
+        with timed('auth'):
+            header = self.get_header(request)
+            if header is None:
+                return None
+            raw_token = self.get_raw_token(header)
+            if raw_token is None:
+                return None
+            validated_token = self.get_validated_token(raw_token)
+            return await self.aget_user(validated_token), validated_token
+
+    def _user_id(self, validated_token):
+        try:
+            return int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def _check_user(self, user):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """Django's scrypt hasher with its cost taken from the PASSWORD_SCRYPT_* settings.
+
+    It keeps the ``scrypt`` algorithm name, so hashes made with other costs
+    still verify and are flagged by ``must_update`` for a rehash on login.
+    """
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+    @property
+    def maxmem(self):
+        # scrypt needs about 128 * n * r bytes; OpenSSL's default cap is 32 MiB.
+        return 2 * 128 * self.work_factor * self.block_size * self.parallelism
@@ -0,0 +1,121 @@
+"""Password hashing on a bounded process pool.
+
+Hashing is CPU bound and holds the GIL, so a burst of logins hashed on the
+request threads starves every other request served by the worker. Hashes
+are computed on a small process pool instead. At most
+PASSWORD_HASHING_WORKERS + PASSWORD_HASHING_QUEUE operations are in flight;
+anything beyond that is rejected at once with a 503 instead of queueing up
+behind the storm. PASSWORD_HASHING_WORKERS = 0 hashes inline.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from blogging_project.instrumentation import timed
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many concurrent password operations, try again shortly.'
+    default_code = 'hashing_unavailable'
+    # Picked up by DRF's exception handler as the Retry-After header.
+    wait = 1
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def process_pool(workers):
+    # Spawned rather than forked: forking a threaded server can copy held locks.
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker)
+
+
+def make_passwords(passwords, executor=None, chunksize=16):
+    """Hash many passwords on ``executor`` (inline without one), for batch jobs rather than requests."""
+    if executor is None:
+        return [hashers.make_password(password) for password in passwords]
+    return list(executor.map(_make_password, passwords, chunksize=chunksize))
+
+
+def _make_password(password):
+    return hashers.make_password(password)
+
+
+def _verify_password(password, encoded):
+    is_correct, must_update = hashers.verify_password(password, encoded)
+    return is_correct, hashers.make_password(password) if is_correct and must_update else None
+
+
+class HashingPool:
+    def __init__(self, workers, queue, timeout):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue) if workers > 0 else None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats = {'completed': 0, 'rejected': 0, 'timed_out': 0}
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = process_pool(self.workers)
+            return self._executor
+
+    def _record(self, outcome):
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def run(self, fn, *args):
+        with timed('hash'):
+            if self._slots is None:
+                result = fn(*args)
+                self._record('completed')
+                return result
+            if not self._slots.acquire(blocking=False):
+                self._record('rejected')
+                raise HashingUnavailable()
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except BaseException:
+                self._slots.release()
+                raise
+            # The slot is held until the worker is done, even if the caller gave up waiting.
+            future.add_done_callback(lambda _: self._slots.release())
+            try:
+                result = future.result(timeout=self.timeout)
+            except TimeoutError:
+                self._record('timed_out')
+                raise HashingUnavailable()
+            except BrokenProcessPool:
+                with self._lock:
+                    self._executor = None
+                self._record('rejected')
+                raise HashingUnavailable()
+            self._record('completed')
+            return result
+
+    def make_password(self, password):
+        return self.run(_make_password, password)
+
+    def verify_password(self, password, encoded):
+        """Return ``(is_correct, new_encoded)``, ``new_encoded`` being set when the hash must be upgraded."""
+        return self.run(_verify_password, password, encoded)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, workers=self.workers)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+pool = HashingPool(settings.PASSWORD_HASHING_WORKERS, settings.PASSWORD_HASHING_QUEUE, settings.PASSWORD_HASHING_TIMEOUT)
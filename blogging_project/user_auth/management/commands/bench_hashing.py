@@ -0,0 +1,59 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand
+from user_auth.hashing import HashingPool, HashingUnavailable
+
+PASSWORD = 'benchmark-password'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password verification throughput, the cost of a login independent of the rest of the "
+        "request: the configured hasher inline, then through a hashing pool under concurrent callers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hasher', default='default', help="Hasher algorithm to measure, e.g. scrypt or pbkdf2_sha256.")
+        parser.add_argument('--requests', type=int, default=200, help="Verifications per run.")
+        parser.add_argument('--concurrency', type=int, default=32, help="Concurrent callers for the pool run.")
+        parser.add_argument('--workers', type=int, default=settings.PASSWORD_HASHING_WORKERS)
+        parser.add_argument('--queue', type=int, default=settings.PASSWORD_HASHING_QUEUE)
+        parser.add_argument('--timeout', type=float, default=settings.PASSWORD_HASHING_TIMEOUT)
+
+    def handle(self, *args, **options):
+        hasher = get_hasher(options['hasher'])
+        encoded = make_password(PASSWORD, hasher=hasher.algorithm)
+        self.stdout.write(f"hasher: {hasher.safe_summary(encoded)}")
+
+        started = time.perf_counter()
+        for _ in range(options['requests']):
+            hasher.verify(PASSWORD, encoded)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{'inline':<8}{options['requests'] / elapsed:>10.1f} verifications/s")
+
+        pool = HashingPool(options['workers'], options['queue'], options['timeout'])
+        pool.verify_password(PASSWORD, encoded)  # Start the workers outside of the measurement.
+
+        def verify(_):
+            started = time.perf_counter()
+            try:
+                pool.verify_password(PASSWORD, encoded)
+            except HashingUnavailable:
+                return None
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as callers:
+            samples = list(callers.map(verify, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+        pool.shutdown()
+
+        latencies = sorted(sample for sample in samples if sample is not None)
+        p95 = statistics.quantiles(latencies, n=20)[18] * 1000 if len(latencies) > 1 else 0.0
+        self.stdout.write(
+            f"{'pool':<8}{len(latencies) / elapsed:>10.1f} verifications/s  p95 {p95:.1f} ms  "
+            f"rejected {len(samples) - len(latencies)} (workers={options['workers']}, queue={options['queue']})"
+        )
@@ -20,5 +20,12 @@ class User(AbstractUser, BaseModel):
     email = models.EmailField(unique=True)
     is_active = models.BooleanField(default=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored value, so a save can tell whether is_active changed (None when deferred).
+        instance._loaded_is_active = instance.__dict__.get('is_active')
+        return instance
+
     def __str__(self):
         return self.username
@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from blogging_project.instrumentation import TimedSerializerMixin
 # from django.contrib.auth.models import User
 from user_auth.models import User
-from django.contrib.auth.hashers import make_password
+from .hashing import pool as hashing_pool
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     created_by = serializers.PrimaryKeyRelatedField(read_only=True)
     is_active = serializers.BooleanField(read_only=True)
 
@@ -13,7 +14,7 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'username', 'email', 'created_by', 'is_active']
 
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=6)
 
     class Meta:
@@ -21,5 +22,5 @@ class RegisterSerializer(serializers.ModelSerializer):
         fields = ['username', 'email', 'password']
 
     def create(self, validated_data):
-        validated_data['password'] = make_password(validated_data['password'])
+        validated_data['password'] = hashing_pool.make_password(validated_data['password'])
         return super().create(validated_data)
@@ -1,3 +1,67 @@
-from django.test import TestCase
+from unittest import mock
+from blogging_project.testing import QueryBudgetTestCase
+from blog.perf import SEED_PASSWORD
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+from user_auth.authentication import UserCache, user_cache
+from user_auth.models import User
 
-# Create your tests here.
+
+class AuthQueryBudgetTests(QueryBudgetTestCase):
+    def test_me(self):
+        self.assertQueryBudget(1, 'get', '/api/auth/me/')
+        self.assertQueryBudget(0, 'get', '/api/auth/me/')
+
+    def test_login(self):
+        self.client.credentials()
+        self.assertQueryBudget(1, 'post', '/api/auth/login/', {'username': self.dataset.admin.username, 'password': SEED_PASSWORD})
+
+    def test_login_rehashes_legacy_password(self):
+        self.client.credentials()
+        admin = self.dataset.admin
+        User.objects.filter(pk=admin.pk).update(password=make_password(SEED_PASSWORD, hasher='pbkdf2_sha256'))
+        self.assertQueryBudget(2, 'post', '/api/auth/login/', {'username': admin.username, 'password': SEED_PASSWORD})
+        admin.refresh_from_db()
+        self.assertTrue(admin.password.startswith('scrypt$'))
+        self.assertTrue(admin.check_password(SEED_PASSWORD))
+
+    def test_refresh(self):
+        self.client.credentials()
+        self.assertQueryBudget(0, 'post', '/api/auth/refresh/', {'refresh': str(RefreshToken.for_user(self.dataset.admin))})
+
+    def test_register(self):
+        self.assertQueryBudget(
+            6, 'post', '/api/auth/register/',
+            {'username': 'budget', 'email': 'budget@example.com', 'password': SEED_PASSWORD}, status=201,
+        )
+
+
+class UserCacheTests(QueryBudgetTestCase):
+    def test_authenticated_writes_do_not_load_the_user(self):
+        blog = self.dataset.blogs[-1]
+        self.client.get('/api/auth/me/')
+        with CaptureQueriesContext(connection) as captured:
+            self.client.post(f'/api/blogs/{blog.pk}/like_blog/')
+            self.client.post(f'/api/blogs/{blog.pk}/comment_blog/', {'content': 'Cached'}, format='json')
+        self.assertFalse([query for query in captured if 'FROM "user_auth_user"' in query['sql']])
+
+    def test_saved_users_are_reloaded(self):
+        user = User.objects.get(pk=self.dataset.users[1].pk)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 200)
+        self.assertIsNotNone(user_cache.get(user.pk))
+        user.is_active = False
+        user.save()
+        self.assertIsNone(user_cache.get(user.pk))
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 401)
+
+    def test_entries_are_bounded_and_expire(self):
+        users = UserCache(max_size=2, ttl=60)
+        for user in self.dataset.users[:3]:
+            users.load(user.pk)
+        self.assertIsNone(users.get(self.dataset.users[0].pk))
+        self.assertEqual(users.get(self.dataset.users[2].pk).username, self.dataset.users[2].username)
+        with mock.patch('time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(users.get(self.dataset.users[2].pk))
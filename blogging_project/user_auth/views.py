@@ -3,9 +3,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from user_auth.models import User
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from blogging_project.apidocs import openapi, swagger_auto_schema
 from .serializers import RegisterSerializer, UserSerializer
+from .hashing import pool as hashing_pool
+from blogging_project.throttling import write_throttles
 
 class IsSuperUser(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -41,7 +42,7 @@ class AuthViewSet(viewsets.ViewSet):
             400: "Bad Request"
         }
     )
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'], throttle_classes=write_throttles)
     def create_superuser(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
@@ -80,7 +81,7 @@ class AuthViewSet(viewsets.ViewSet):
             400: "Bad Request"
         }
     )
-    @action(detail=False, methods=['post'], permission_classes=[IsSuperUser])
+    @action(detail=False, methods=['post'], permission_classes=[IsSuperUser], throttle_classes=write_throttles)
     def register(self, request):
         serializer = RegisterSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -119,7 +120,8 @@ class AuthViewSet(viewsets.ViewSet):
                     }
                 )
             ),
-            401: "Unauthorized - Invalid credentials"
+            401: "Unauthorized - Invalid credentials",
+            503: "Password hashing saturated, retry after the Retry-After delay"
         }
     )
     @action(detail=False, methods=['post'])
@@ -131,8 +133,13 @@ class AuthViewSet(viewsets.ViewSet):
         except User.DoesNotExist:
             return Response({"error": "User not found"}, status=status.HTTP_401_UNAUTHORIZED)
 
-        if not user.check_password(password):
+        is_correct, upgraded_password = hashing_pool.verify_password(password, user.password)
+        if not is_correct:
             return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
+        if upgraded_password:
+            # Hashed with an older hasher or cost, store it with the current one.
+            user.password = upgraded_password
+            user.save(update_fields=['password'])
         
         refresh = RefreshToken.for_user(user)
         access_token = refresh.access_token